@@ -0,0 +1,98 @@
+"""Read throughput of several threads while another one keeps posting.
+
+    python -m benchmarks.concurrency --readers 4 --seconds 10
+    python -m benchmarks.concurrency --no-pragmas
+
+The database is a temporary file: an in-memory SQLite database has no WAL.
+``--no-pragmas`` replaces ``SQLITE_PRAGMAS`` with the rollback journal
+SQLite uses by default, for comparison.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks.utils import insert_posts, setup_django, test_database
+
+
+def run_load(readers, seconds, author):
+    """Read and write for ``seconds``; return reads, writes and lock errors."""
+    from django.db import OperationalError, connection
+
+    from posts.models import Post
+
+    stop = threading.Event()
+    counts = {'reads': 0, 'writes': 0, 'locked': 0}
+    lock = threading.Lock()
+
+    def loop(key, func):
+        try:
+            while not stop.is_set():
+                try:
+                    func()
+                except OperationalError:
+                    outcome = 'locked'
+                else:
+                    outcome = key
+                with lock:
+                    counts[outcome] += 1
+        finally:
+            connection.close()
+
+    def read():
+        list(Post.objects.feed()[:10])
+
+    def write():
+        Post.objects.create(author=author, text='Новый пост')
+
+    threads = [
+        threading.Thread(target=loop, args=('reads', read))
+        for _ in range(readers)
+    ]
+    threads.append(threading.Thread(target=loop, args=('writes', write)))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=100000)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--no-pragmas', action='store_true')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.db import connection, transaction
+
+    if args.no_pragmas:
+        settings.SQLITE_PRAGMAS = {'journal_mode': 'delete'}
+    directory = tempfile.TemporaryDirectory()
+    connection.settings_dict['TEST']['NAME'] = os.path.join(
+        directory.name, 'concurrency.sqlite3')
+
+    with directory, test_database() as main_connection:
+        author = get_user_model().objects.create(username='bench')
+        with transaction.atomic():
+            insert_posts(main_connection, args.posts, author.pk)
+        with main_connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode, = cursor.fetchone()
+        counts = run_load(args.readers, args.seconds, author)
+
+    print(f'journal_mode={journal_mode}, {args.readers} readers, 1 writer')
+    print(f'reads  {counts["reads"] / args.seconds:10.0f} /s')
+    print(f'writes {counts["writes"] / args.seconds:10.0f} /s')
+    print(f'locked {counts["locked"]:10d}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Throughput of the export_posts and import_posts commands.
+
+    python -m benchmarks.import_export --posts 200000
+
+Known gap: the target is 50k posts/s each way. With the single-column
+author and group indexes on posts_post, import measures about 37k posts/s
+and export about 42k posts/s on an in-memory database.
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.utils import insert_posts, setup_django, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=200000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.db import transaction
+
+    from posts.models import Post
+
+    with test_database() as connection:
+        author = get_user_model().objects.create(username='bench')
+        with transaction.atomic():
+            insert_posts(connection, args.posts, author.pk)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'posts.jsonl')
+            start = time.perf_counter()
+            call_command('export_posts', path, stderr=io.StringIO())
+            export_time = time.perf_counter() - start
+            Post.objects.all()._raw_delete(Post.objects.db)
+            start = time.perf_counter()
+            call_command('import_posts', path, stdout=io.StringIO())
+            import_time = time.perf_counter() - start
+        print(f'{args.posts} posts')
+        print(f'export {args.posts / export_time:12.0f} posts/s')
+        print(f'import {args.posts / import_time:12.0f} posts/s')
+
+
+if __name__ == '__main__':
+    main()
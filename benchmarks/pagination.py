@@ -0,0 +1,65 @@
+"""Compare OFFSET and keyset pagination of the index feed.
+
+    python -m benchmarks.pagination --posts 1000000 --page 10000
+"""
+import argparse
+
+from benchmarks.utils import (insert_posts, measure, setup_django,
+                              test_database)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=1000000)
+    parser.add_argument('--page', type=int, default=10000)
+    parser.add_argument('--per-page', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.core.paginator import Paginator
+    from django.db import transaction
+
+    from posts.models import Post
+    from posts.paginator import CursorPaginator, encode_cursor
+
+    with test_database() as connection:
+        author = get_user_model().objects.create(username='bench')
+        with transaction.atomic():
+            insert_posts(connection, args.posts, author.pk)
+        queryset = Post.objects.all()
+        deep = (args.page - 1) * args.per_page
+        before_deep = Post.objects.order_by('-pub_date', '-id')[deep - 1]
+        cursor = encode_cursor(before_deep)
+
+        def offset_page(number):
+            return lambda: list(
+                Paginator(queryset, args.per_page).page(number)
+            )
+
+        def cursor_page(number, after=None, approximate=False):
+            return lambda: list(
+                CursorPaginator(
+                    queryset, args.per_page, approximate_count=approximate
+                ).page(number, after=after)
+            )
+
+        cases = [
+            ('offset, page 1', offset_page(1)),
+            (f'offset, page {args.page}', offset_page(args.page)),
+            ('cursor, page 1', cursor_page(1)),
+            (f'cursor, page {args.page}', cursor_page(args.page, cursor)),
+            ('cursor approximate, page 1', cursor_page(1, approximate=True)),
+            (
+                f'cursor approximate, page {args.page}',
+                cursor_page(args.page, cursor, approximate=True)
+            ),
+        ]
+        print(f'{args.posts} posts, {args.per_page} per page')
+        for name, func in cases:
+            print(f'{name:<40} {measure(func, args.repeat):10.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Compare the FTS5 search index with the LIKE scan used before it.
+
+    python -m benchmarks.search --posts 200000
+"""
+import argparse
+import random
+
+from benchmarks.utils import (insert_posts, measure, setup_django,
+                              test_database)
+
+WORDS = (
+    'капучино круассан чай книга роман поэзия лето зима море горы город '
+    'поезд музыка кино театр друг письмо вечер утро дождь снег солнце'
+).split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=200000)
+    parser.add_argument('--words', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.core.paginator import Paginator
+    from django.db import transaction
+
+    from posts.models import Post
+    from posts.search import search_posts
+
+    rng = random.Random(args.seed)
+    vocabulary = WORDS + [f'слово{i}' for i in range(5000)]
+
+    def make_text(i):
+        return ' '.join(rng.choice(vocabulary) for _ in range(args.words))
+
+    with test_database() as connection:
+        author = get_user_model().objects.create(username='bench')
+        with transaction.atomic():
+            insert_posts(connection, args.posts, author.pk,
+                         make_text=make_text)
+
+        def like_page(term):
+            queryset = Post.objects.feed().filter(text__icontains=term)
+            return lambda: list(
+                Paginator(queryset, settings.POSTS_PER_PAGE).page(1))
+
+        def fts_page(term):
+            return lambda: list(
+                Paginator(
+                    search_posts(term), settings.POSTS_PER_PAGE
+                ).page(1)
+            )
+
+        print(f'{args.posts} posts, {args.words} words each')
+        for term in ('капучино', 'слово4999', 'несуществующее'):
+            for name, func in (('LIKE', like_page), ('FTS5', fts_page)):
+                timing = measure(func(term), args.repeat)
+                print(f'{name:<6} {term:<16} {timing:10.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
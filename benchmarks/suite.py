@@ -0,0 +1,218 @@
+"""Timings of the posts views, templates and feed queries.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --compare baseline.json --threshold 0.2
+
+Every benchmark runs at each of ``--sizes`` posts and reports its median
+time. ``--output`` writes the results as JSON; a file written this way is
+the baseline for a later ``--compare``. In compare mode a benchmark that got
+slower than its baseline by more than ``--threshold`` (a fraction) is
+reported, and the exit status is 1.
+"""
+import argparse
+import json
+import platform
+import sys
+
+from benchmarks.utils import (insert_posts, measure, setup_django,
+                              test_database)
+
+AUTHORS = 10
+
+
+def populate(connection, count, authors, group):
+    """Spread ``count`` posts over the authors; every other one is grouped.
+    """
+    from django.db import transaction
+
+    from posts.counters import recount_posts
+
+    per_author, rest = divmod(count, len(authors))
+    with transaction.atomic():
+        for number, author in enumerate(authors):
+            insert_posts(
+                connection,
+                per_author + (number < rest),
+                author.pk,
+                group.pk if number % 2 == 0 else None,
+            )
+        recount_posts()
+
+
+def view_benchmarks(author, group, post):
+    from django.test import Client
+    from django.urls import reverse
+
+    guest = Client()
+    owner = Client()
+    owner.force_login(author)
+    username = author.username
+    post_kwargs = {'username': username, 'post_id': post.pk}
+
+    def get(client, url):
+        return lambda: client.get(url)
+
+    return {
+        'view index': get(guest, reverse('posts:index')),
+        'view index page 2': get(guest, reverse('posts:index') + '?page=2'),
+        'view group_posts': get(
+            guest, reverse('posts:group', kwargs={'slug': group.slug})),
+        'view profile': get(
+            guest, reverse('posts:profile', kwargs={'username': username})),
+        'view post_view': get(
+            guest, reverse('posts:post', kwargs=post_kwargs)),
+        'view post_edit': get(
+            owner, reverse('posts:post_edit', kwargs=post_kwargs)),
+        'view NewPostView': get(owner, reverse('posts:new_post')),
+        'view NewPostView submit': lambda: owner.post(
+            reverse('posts:new_post'), {'text': 'Новая запись'}),
+    }
+
+
+def template_benchmarks(author):
+    from django.conf import settings
+    from django.contrib.auth.models import AnonymousUser
+    from django.template.loader import render_to_string
+    from django.test import RequestFactory
+
+    from posts.cache import INDEX_FEED, author_feed, feed_cache_context
+    from posts.models import Post
+    from posts.paginator import CursorPaginator
+
+    request = RequestFactory().get('/')
+    request.user = AnonymousUser()
+
+    def page(queryset):
+        return CursorPaginator(queryset, settings.POSTS_PER_PAGE).page(1)
+
+    index_context = {
+        'page': page(Post.objects.feed()),
+        **feed_cache_context(INDEX_FEED),
+    }
+    profile_context = {
+        'page': page(Post.objects.feed().filter(author=author)),
+        'author': author,
+        'num_posts': author.profile.post_count,
+        'is_owner': False,
+        **feed_cache_context(author_feed(author.pk)),
+    }
+
+    def render(template, context):
+        return lambda: render_to_string(template, context, request)
+
+    return {
+        'template index.html': render('index.html', index_context),
+        'template profile.html': render('profile.html', profile_context),
+        'template paginator.html': render(
+            'include/paginator.html', index_context),
+    }
+
+
+def query_benchmarks(author, group):
+    from django.conf import settings
+
+    from posts.models import Post
+    from posts.paginator import CURSOR_ORDERING
+
+    per_page = settings.POSTS_PER_PAGE
+
+    def fetch(queryset):
+        queryset = queryset.order_by(*CURSOR_ORDERING)
+        return lambda: list(queryset[:per_page + 1])
+
+    return {
+        'query index feed': fetch(Post.objects.feed()),
+        'query group feed': fetch(Post.objects.feed().filter(group=group)),
+        'query author feed': fetch(Post.objects.feed().filter(author=author)),
+        'query index count': lambda: Post.objects.count(),
+    }
+
+
+def run(sizes, repeat):
+    from django.contrib.auth import get_user_model
+    from django.test.utils import override_settings
+
+    from posts.models import Group, Post
+
+    results = {}
+    # Rendered fragments would be served from the cache after the first
+    # round; time the full path instead.
+    no_cache = override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+    with test_database() as connection, no_cache:
+        User = get_user_model()
+        authors = [
+            User.objects.create(username=f'bench{number}')
+            for number in range(AUTHORS)
+        ]
+        group = Group.objects.create(title='Бенчмарк', slug='bench')
+        inserted = 0
+        for size in sorted(sizes):
+            populate(connection, size - inserted, authors, group)
+            inserted = size
+            author = User.objects.select_related('profile').get(
+                pk=authors[0].pk)
+            post = Post.objects.filter(author=author).latest('pk')
+            benchmarks = {
+                **view_benchmarks(author, group, post),
+                **template_benchmarks(author),
+                **query_benchmarks(author, group),
+            }
+            for name, func in benchmarks.items():
+                func()
+                key = f'{name} @ {size}'
+                results[key] = measure(func, repeat)
+                print(f'{key:<45} {results[key]:10.2f} ms')
+            # Submitted posts are not part of the next dataset size.
+            inserted = Post.objects.count()
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, time in sorted(results.items()):
+        if name not in baseline:
+            continue
+        change = time / baseline[name] - 1 if baseline[name] else 0
+        if change > threshold:
+            regressions.append((name, baseline[name], time, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--output')
+    parser.add_argument('--compare')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args()
+
+    setup_django()
+    results = run(args.sizes, args.repeat)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'repeat': args.repeat,
+                'results': results,
+            }, output, ensure_ascii=False, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline:
+            baseline = json.load(baseline)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after, change in regressions:
+            print(
+                f'REGRESSION {name}: {before:.2f} -> {after:.2f} ms '
+                f'(+{change:.0%})'
+            )
+        if regressions:
+            sys.exit(1)
+        print(f'No regressions above {args.threshold:.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Render time of profile.html with and without the cached template loader.
+
+    python -m benchmarks.templates --repeat 200
+
+The page is rendered with no posts and with a full page of posts; the
+difference, divided by the page size, is the cost of one post. Without the
+cache every {% include %} in the post loop is read and compiled again.
+"""
+import argparse
+import copy
+
+from benchmarks.utils import insert_posts, measure, setup_django, test_database
+
+SOURCE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+LOADERS = {
+    'uncached': SOURCE_LOADERS,
+    'cached': [('django.template.loaders.cached.Loader', SOURCE_LOADERS)],
+}
+
+
+def backend(name, loaders):
+    from django.conf import settings
+    from django.template.backends.django import DjangoTemplates
+
+    params = copy.deepcopy(settings.TEMPLATES[0])
+    del params['BACKEND']
+    params.update(NAME=name, APP_DIRS=False)
+    params['OPTIONS']['debug'] = False
+    params['OPTIONS']['loaders'] = loaders
+    return DjangoTemplates(params)
+
+
+def profile_context(author, queryset):
+    from django.conf import settings
+
+    from posts.cache import author_feed, feed_cache_context
+    from posts.paginator import CursorPaginator
+
+    return {
+        'page': CursorPaginator(queryset, settings.POSTS_PER_PAGE).page(1),
+        'author': author,
+        'num_posts': author.profile.post_count,
+        'is_owner': False,
+        **feed_cache_context(author_feed(author.pk)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import AnonymousUser
+    from django.test import RequestFactory
+    from django.test.utils import override_settings
+
+    from posts.counters import recount_posts
+    from posts.models import Post
+
+    request = RequestFactory().get('/')
+    request.user = AnonymousUser()
+    per_page = settings.POSTS_PER_PAGE
+    # The rendered feed would come from the cache after the first round.
+    no_cache = override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+    with test_database() as connection, no_cache:
+        author = get_user_model().objects.create(username='bench')
+        insert_posts(connection, per_page, author.pk)
+        recount_posts()
+        author.refresh_from_db()
+        feed = Post.objects.feed().filter(author=author)
+        # Evaluated once, so only rendering is timed.
+        contexts = {
+            0: profile_context(author, feed.none()),
+            per_page: profile_context(author, feed),
+        }
+        for context in contexts.values():
+            context['page'].object_list = list(context['page'].object_list)
+
+        print(f'{"loader":<10} {"0 posts":>10} {f"{per_page} posts":>10} '
+              f'{"per post":>10}')
+        for name, loaders in LOADERS.items():
+            template = backend(name, loaders).get_template('profile.html')
+            timings = {}
+            for posts, context in contexts.items():
+                def render():
+                    template.render(context, request)
+                render()
+                timings[posts] = measure(render, args.repeat)
+            per_post = (timings[per_page] - timings[0]) / per_page
+            print(f'{name:<10} {timings[0]:8.3f}ms {timings[per_page]:8.3f}ms '
+                  f'{per_post:8.3f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import contextlib
+import datetime
+import os
+import statistics
+import time
+
+import django
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+    django.setup()
+
+
+@contextlib.contextmanager
+def test_database():
+    """Run the benchmark against a throwaway copy of the schema."""
+    from django.db import connection
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(func, repeat=5):
+    """Return the median wall time of ``func`` in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def insert_posts(connection, count, author_id, group_id=None,
+                 batch_size=10000, make_text=None):
+    """Fill ``posts_post`` directly, one post per second going back."""
+    make_text = make_text or (lambda i: f'Пост номер {i}')
+    start = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    sql = (
+        'INSERT INTO posts_post (text, pub_date, author_id, group_id) '
+        'VALUES (%s, %s, %s, %s)'
+    )
+    with connection.cursor() as cursor:
+        for offset in range(0, count, batch_size):
+            rows = [
+                (
+                    make_text(i),
+                    start + datetime.timedelta(seconds=i),
+                    author_id,
+                    group_id,
+                )
+                for i in range(offset, min(offset + batch_size, count))
+            ]
+            cursor.executemany(sql, rows)
@@ -1,14 +1,41 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 
 from .models import Group, Post
+from .paginator import EstimatedCountPaginator
+from .search import filter_by_search
+
+
+class PostChangeList(ChangeList):
+    def get_ordering(self, request, queryset):
+        ordering = super().get_ordering(request, queryset)
+        # Break pub_date ties in the same direction, so that post_pub_date_idx
+        # serves the sort either way and date filters are range scans on it.
+        if 'pub_date' in ordering and '-pk' in ordering:
+            ordering[ordering.index('-pk')] = 'pk'
+        return ordering
 
 
 class PostAdmin(admin.ModelAdmin):
-    list_display = ('pk', 'text', 'pub_date', 'author')
+    list_display = ('pk', 'text', 'pub_date', 'author', 'group')
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
     list_filter = ('pub_date',)
+    # Sorting by any other column would sort the whole table.
+    sortable_by = ('pk', 'pub_date')
+    paginator = EstimatedCountPaginator
+    # The total is shown only for unfiltered lists, where it is estimated.
+    show_full_result_count = False
     empty_value_display = '-пусто-'
 
+    def get_changelist(self, request, **kwargs):
+        return PostChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return filter_by_search(queryset, search_term), False
+
 
 class GroupAdmin(admin.ModelAdmin):
     list_display = ('title', 'slug', 'description')
@@ -0,0 +1,93 @@
+"""Monthly post counts behind the archive pages.
+
+``MonthlyPostCount`` has a row per month for the whole site, every group
+and every author, so the month list of an archive page is an index lookup
+instead of a ``GROUP BY`` over all posts. Post signals adjust the rows of
+one post with an upsert; bulk writes rebuild the table in one statement.
+Months are UTC months.
+"""
+import datetime
+from collections import namedtuple
+
+from django.db import connection
+
+from .models import MonthlyPostCount
+
+INDEX_SCOPE = 'index'
+
+TABLE = MonthlyPostCount._meta.db_table
+UPSERT_SQL = (
+    f'INSERT INTO {TABLE} (scope, month, count) VALUES (%s, %s, %s) '
+    f'ON CONFLICT (scope, month) DO UPDATE SET count = count + excluded.count'
+)
+MONTH_SQL = "strftime('%Y-%m-01', pub_date)"
+REBUILD_SQL = (
+    f"INSERT INTO {TABLE} (scope, month, count) "
+    f"SELECT 'index', {MONTH_SQL}, COUNT(*) FROM posts_post "
+    f"GROUP BY 2 "
+    f"UNION ALL "
+    f"SELECT 'author:' || author_id, {MONTH_SQL}, COUNT(*) FROM posts_post "
+    f"GROUP BY author_id, 2 "
+    f"UNION ALL "
+    f"SELECT 'group:' || group_id, {MONTH_SQL}, COUNT(*) FROM posts_post "
+    f"WHERE group_id IS NOT NULL GROUP BY group_id, 2"
+)
+
+ArchiveMonth = namedtuple('ArchiveMonth', 'month count')
+
+
+def group_scope(group_id):
+    return f'group:{group_id}'
+
+
+def author_scope(author_id):
+    return f'author:{author_id}'
+
+
+def post_scopes(author_id, group_id):
+    scopes = [INDEX_SCOPE, author_scope(author_id)]
+    if group_id is not None:
+        scopes.append(group_scope(group_id))
+    return scopes
+
+
+def month_of(pub_date):
+    return pub_date.astimezone(datetime.timezone.utc).date().replace(day=1)
+
+
+def change_month_counts(scopes, pub_date, delta=1):
+    month = month_of(pub_date).isoformat()
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            UPSERT_SQL, [(scope, month, delta) for scope in scopes])
+
+
+def rebuild_archive():
+    """Recount every month; for posts written around the signals."""
+    MonthlyPostCount.objects.all().delete()
+    with connection.cursor() as cursor:
+        cursor.execute(REBUILD_SQL)
+
+
+def month_counts(scope):
+    """Months of ``scope`` that have posts, the latest first."""
+    return [
+        ArchiveMonth(*row)
+        for row in MonthlyPostCount.objects.filter(
+            scope=scope, count__gt=0
+        ).order_by('-month').values_list('month', 'count')
+    ]
+
+
+def period_range(year, month=None):
+    """Bounds of a year or a month as aware datetimes.
+
+    Raises ``ValueError`` for a date out of range.
+    """
+    start = datetime.datetime(
+        year, month or 1, 1, tzinfo=datetime.timezone.utc)
+    if month is None:
+        return start, start.replace(year=year + 1)
+    if month == 12:
+        return start, start.replace(year=year + 1, month=1)
+    return start, start.replace(month=month + 1)
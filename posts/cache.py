@@ -0,0 +1,57 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+INDEX_FEED = 'index'
+# Post counts and latest posts of every group, see views.group_index.
+GROUPS_FEED = 'groups'
+
+
+def group_feed(group_id):
+    return f'group:{group_id}'
+
+
+def author_feed(author_id):
+    return f'author:{author_id}'
+
+
+def post_feeds(post):
+    feeds = [INDEX_FEED, author_feed(post.author_id)]
+    group_ids = {post.group_id, getattr(post, '_loaded_group_id', None)}
+    group_ids.discard(None)
+    if group_ids:
+        feeds.append(GROUPS_FEED)
+    feeds.extend(group_feed(group_id) for group_id in group_ids)
+    return feeds
+
+
+def _version_key(feed):
+    return f'feed-version:{feed}'
+
+
+def feed_version(feed):
+    """Current version of a feed; cached fragments are keyed on it.
+
+    A missing version is replaced with a fresh random token, so fragments
+    rendered before an eviction are never served again.
+    """
+    key = _version_key(feed)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_feeds(feeds):
+    cache.set_many(
+        {_version_key(feed): uuid.uuid4().hex for feed in feeds}, None)
+
+
+def feed_cache_context(feed):
+    return {
+        'feed_cache_timeout': settings.FEED_CACHE_TIMEOUT,
+        'feed_key': feed,
+        'feed_version': feed_version(feed),
+    }
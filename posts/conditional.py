@@ -0,0 +1,53 @@
+"""Validators for conditional GET of the feed and post pages.
+
+Every post write bumps ``modified`` on the author's profile and the post's
+group (see ``posts.counters``), and so does renaming the author, so a
+single indexed lookup tells whether a page may have changed. The index
+covers every author and is validated by the version of its cached feed
+instead: unlike the newest ``modified``, it never goes back to an earlier
+value when a user is deleted.
+
+Pages are validated by ETag only. ``Last-Modified`` has one-second
+resolution: a post written in the second of the first fetch would be
+answered 304 to ``If-Modified-Since``.
+"""
+from django.views.decorators.http import condition
+
+from .cache import INDEX_FEED, feed_version
+from .models import Group, Post, Profile
+
+
+def index_state():
+    return feed_version(INDEX_FEED), None
+
+
+def group_state(slug):
+    return Group.objects.filter(slug=slug).values_list(
+        'modified', 'post_count').first()
+
+
+def profile_state(username):
+    return Profile.objects.filter(user__username=username).values_list(
+        'modified', 'post_count').first()
+
+
+def post_state(username, post_id):
+    return Post.objects.filter(
+        pk=post_id, author__username=username
+    ).values_list(
+        'author__profile__modified', 'author__profile__post_count'
+    ).first()
+
+
+def conditional_feed(get_state):
+    """``condition`` decorator with an ETag read in one query."""
+
+    def etag(request, *args, **kwargs):
+        version, count = get_state(*args, **kwargs) or (None, None)
+        if version is None:
+            return None
+        if not isinstance(version, str):
+            version = version.timestamp()
+        return f'{version}-{count}-{request.user.pk or 0}'
+
+    return condition(etag_func=etag)
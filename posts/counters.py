@@ -0,0 +1,80 @@
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import Follow, Group, Post, Profile, User
+
+
+def get_post_count(user):
+    try:
+        return user.profile.post_count
+    except Profile.DoesNotExist:
+        return user.posts.count()
+
+
+def change_post_counts(author_id=None, group_id=None, delta=1,
+                       last_post=None):
+    """Add ``delta`` to the counters and mark both feeds as modified.
+
+    ``last_post`` is a new post that becomes the latest one of the group.
+    """
+    # Never go below zero; counters that drifted are fixed by recount_posts.
+    changes = {
+        'post_count': Greatest(F('post_count') + delta, 0),
+        'modified': timezone.now(),
+    }
+    if author_id is not None:
+        updated = Profile.objects.filter(user_id=author_id).update(**changes)
+        # A profile is missing on delete when the author goes with it.
+        if not updated and delta >= 0:
+            recount_posts(users=User.objects.filter(pk=author_id),
+                          groups=Group.objects.none())
+    if group_id is not None:
+        if last_post is not None:
+            changes['last_post'] = last_post
+        Group.objects.filter(pk=group_id).update(**changes)
+
+
+def change_follow_counts(user_id, author_id, delta=1):
+    """Count a follow of ``author_id`` by ``user_id`` on both profiles."""
+    now = timezone.now()
+    Profile.objects.filter(user_id=user_id).update(
+        following_count=Greatest(F('following_count') + delta, 0),
+        modified=now)
+    Profile.objects.filter(user_id=author_id).update(
+        follower_count=Greatest(F('follower_count') + delta, 0),
+        modified=now)
+
+
+def _latest_post():
+    rows = Post.objects.filter(group=OuterRef('pk'))
+    return Subquery(rows.order_by('-pub_date', '-id').values('pk')[:1])
+
+
+def change_last_posts(group_ids):
+    """Find the latest post again, after one left the groups."""
+    Group.objects.filter(pk__in=group_ids).update(last_post=_latest_post())
+
+
+def _count(model, field, outer_field):
+    rows = model.objects.filter(**{field: OuterRef(outer_field)})
+    rows = rows.order_by().values(field).annotate(total=Count('pk'))
+    return Coalesce(Subquery(rows.values('total')), 0)
+
+
+def recount_posts(users=None, groups=None):
+    """Recompute post and follow counters with one UPDATE per table."""
+    users = User.objects.all() if users is None else users
+    groups = Group.objects.all() if groups is None else groups
+    missing = users.filter(profile__isnull=True).values_list('pk', flat=True)
+    Profile.objects.bulk_create([Profile(user_id=pk) for pk in missing])
+    now = timezone.now()
+    Profile.objects.filter(user__in=users.values('pk')).update(
+        post_count=_count(Post, 'author', 'user'),
+        follower_count=_count(Follow, 'author', 'user'),
+        following_count=_count(Follow, 'user', 'user'),
+        modified=now)
+    groups.update(
+        post_count=_count(Post, 'group', 'pk'),
+        last_post=_latest_post(),
+        modified=now)
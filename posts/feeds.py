@@ -0,0 +1,70 @@
+"""RSS 2.0 feeds streamed straight from the database cursor.
+
+``django.contrib.syndication`` builds the whole document in memory, so the
+feeds here are written item by item into a ``StreamingHttpResponse``.
+"""
+import io
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils.feedgenerator import rfc2822_date
+from django.utils.text import Truncator
+from django.utils.xmlutils import SimplerXMLGenerator
+
+from .paginator import CURSOR_ORDERING
+
+CHUNK_SIZE = 200
+ITEM_FIELDS = ('pk', 'text', 'pub_date', 'author__username', 'group__title')
+TITLE_LENGTH = 60
+
+
+def feed_items(queryset):
+    """Newest posts as plain tuples, read from the cursor in chunks."""
+    items = queryset.order_by(*CURSOR_ORDERING).values_list(*ITEM_FIELDS)
+    return items[:settings.RSS_ITEMS].iterator(chunk_size=CHUNK_SIZE)
+
+
+def stream_rss(request, title, link, description, items):
+    buffer = io.StringIO()
+    handler = SimplerXMLGenerator(buffer, 'utf-8')
+
+    def flush():
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    handler.startDocument()
+    handler.startElement('rss', {'version': '2.0'})
+    handler.startElement('channel', {})
+    handler.addQuickElement('title', title)
+    handler.addQuickElement('link', request.build_absolute_uri(link))
+    handler.addQuickElement('description', description)
+    handler.addQuickElement('language', settings.LANGUAGE_CODE)
+    yield flush()
+    for pk, text, pub_date, username, group_title in items:
+        url = request.build_absolute_uri(reverse(
+            'posts:post', kwargs={'username': username, 'post_id': pk}))
+        handler.startElement('item', {})
+        handler.addQuickElement('title', Truncator(text).chars(TITLE_LENGTH))
+        handler.addQuickElement('link', url)
+        handler.addQuickElement('description', text)
+        handler.addQuickElement('author', username)
+        if group_title:
+            handler.addQuickElement('category', group_title)
+        handler.addQuickElement('pubDate', rfc2822_date(pub_date))
+        handler.addQuickElement('guid', url, {'isPermaLink': 'true'})
+        handler.endElement('item')
+        yield flush()
+    handler.endElement('channel')
+    handler.endElement('rss')
+    handler.endDocument()
+    yield flush()
+
+
+def rss_response(request, title, link, description, queryset):
+    return StreamingHttpResponse(
+        stream_rss(request, title, link, description, feed_items(queryset)),
+        content_type='application/rss+xml; charset=utf-8'
+    )
@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from posts.models import Post
+from posts.paginator import CursorPaginator, encode_cursor
+
+
+def feed_querysets():
+    """The feed queries run by ``posts.views``, one per paginator mode."""
+    feeds = {
+        'index': Post.objects.feed(),
+        'group': Post.objects.feed().filter(group_id=1),
+        'profile': Post.objects.feed().filter(author_id=1),
+    }
+    cursor = encode_cursor(Post(pk=1, pub_date=timezone.now()))
+    for name, queryset in feeds.items():
+        paginator = CursorPaginator(queryset, settings.POSTS_PER_PAGE)
+        yield f'{name}: count', queryset.order_by().values('pk')
+        yield f'{name}: page 2', paginator.slice_queryset(2)
+        yield (
+            f'{name}: after cursor',
+            paginator.slice_queryset(2, after=cursor)
+        )
+        yield (
+            f'{name}: before cursor',
+            paginator.slice_queryset(2, before=cursor)
+        )
+
+
+def is_full_sort(plan):
+    details = [row[-1] for row in plan]
+    return (
+        any(detail.startswith('USE TEMP B-TREE') for detail in details)
+        and any(
+            detail.startswith('SCAN') and 'USING' not in detail
+            for detail in details
+        )
+    )
+
+
+class Command(BaseCommand):
+    help = 'Печатает EXPLAIN QUERY PLAN для запросов лент постов'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Команда работает только с SQLite')
+        failed = []
+        with connection.cursor() as cursor:
+            for name, queryset in feed_querysets():
+                sql, params = queryset.query.sql_with_params()
+                if name.endswith(': count'):
+                    sql = f'SELECT COUNT(*) FROM ({sql}) subquery'
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                plan = cursor.fetchall()
+                self.stdout.write(self.style.MIGRATE_HEADING(name))
+                for row in plan:
+                    self.stdout.write(f'  {row[-1]}')
+                if is_full_sort(plan):
+                    failed.append(name)
+        if failed:
+            raise CommandError(
+                'Полный просмотр с сортировкой: ' + ', '.join(failed))
+        self.stdout.write(self.style.SUCCESS('Все ленты используют индексы'))
@@ -0,0 +1,46 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Выгружает записи в JSONL: одна запись на строку'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output', nargs='?', default='-',
+            help='Файл для выгрузки, по умолчанию stdout')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        rows = Post.objects.order_by('pk').values_list(
+            'text', 'pub_date', 'author__username', 'group__slug'
+        ).iterator(chunk_size=options['chunk_size'])
+        output = (
+            sys.stdout if options['output'] == '-'
+            else open(options['output'], 'w', encoding='utf-8')
+        )
+        start = time.perf_counter()
+        count = 0
+        try:
+            for text, pub_date, author, group in rows:
+                output.write(json.dumps({
+                    'text': text,
+                    'pub_date': pub_date.isoformat(),
+                    'author': author,
+                    'group': group,
+                }, ensure_ascii=False))
+                output.write('\n')
+                count += 1
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        elapsed = time.perf_counter() - start
+        self.stderr.write(
+            f'Выгружено записей: {count} '
+            f'({count / elapsed if elapsed else 0:.0f} в секунду)'
+        )
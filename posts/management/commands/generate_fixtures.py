@@ -0,0 +1,134 @@
+import bisect
+import datetime
+import itertools
+import random
+import time
+
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from posts.bulk import insert_posts, posts_written
+from posts.models import Group, User
+
+WORDS = (
+    'привет друзья сегодня вчера завтра утро вечер ночь город море горы лес '
+    'река поезд самолёт дорога книга роман стихи музыка кино театр выставка '
+    'кофе чай завтрак обед ужин работа отпуск лето осень зима весна дождь '
+    'снег солнце ветер кот собака друг семья дом окно письмо новость мысль '
+    'идея проект код python django база запрос страница лента подписка'
+).split()
+# Distinct texts to draw posts from; generating one per post is slower
+# than inserting it.
+TEXT_POOL = 2 ** 16
+
+
+class Command(BaseCommand):
+    help = 'Заполняет базу синтетическими пользователями, группами и записями'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--groups', type=int, default=100)
+        parser.add_argument('--posts', type=int, default=1000000)
+        parser.add_argument(
+            '--no-group-share', type=float, default=0.3,
+            help='Доля записей без группы')
+        parser.add_argument(
+            '--skew', type=float, default=1.2,
+            help='Показатель степенного распределения записей по авторам')
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help='За сколько дней до --end распределить даты записей')
+        parser.add_argument(
+            '--end', type=datetime.date.fromisoformat,
+            default=datetime.date.today(),
+            help='Дата последней записи, по умолчанию сегодня')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--transaction-size', type=int, default=250000,
+            help='Записей в одной транзакции')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1:
+            raise CommandError('Нужен хотя бы один пользователь')
+        rng = random.Random(options['seed'])
+        start = time.perf_counter()
+        with transaction.atomic():
+            authors = self.create(
+                User, 'username', 'user_', options['users'],
+                lambda name: User(
+                    username=name, password=UNUSABLE_PASSWORD_PREFIX))
+            groups = self.create(
+                Group, 'slug', 'group_', options['groups'],
+                lambda name: Group(title=name, slug=name))
+        rows = self.rows(rng, authors, groups, options)
+        count = 0
+        while True:
+            chunk = itertools.islice(rows, options['transaction_size'])
+            with transaction.atomic():
+                written = insert_posts(chunk)
+            if not written:
+                break
+            count += written
+            self.stderr.write(f'{count} записей…')
+        with transaction.atomic():
+            posts_written(authors, groups)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано записей: {count} за {elapsed:.1f} с'))
+
+    def create(self, model, field, prefix, number, make):
+        """Ids of ``prefix0``… objects, creating the missing ones."""
+        names = [f'{prefix}{index}' for index in range(number)]
+        existing = dict(model.objects.filter(
+            **{f'{field}__startswith': prefix}).values_list(field, 'pk'))
+        model.objects.bulk_create(
+            [make(name) for name in names if name not in existing])
+        ids = dict(model.objects.filter(
+            **{f'{field}__startswith': prefix}).values_list(field, 'pk'))
+        return [ids[name] for name in names]
+
+    def rows(self, rng, authors, groups, options):
+        """Posts in chronological order with power-law skewed authors."""
+        count = options['posts']
+        pick_author = self.power_law(rng, authors, options['skew'])
+        pick_group = self.power_law(rng, groups, options['skew'])
+        texts = [self.text(rng) for _ in range(TEXT_POOL)]
+        end = datetime.datetime.combine(
+            options['end'], datetime.time.max, datetime.timezone.utc
+        ).timestamp()
+        span = options['days'] * 24 * 60 * 60
+        # Exponential gaps, as between independent events, that add up to
+        # roughly the whole span.
+        mean_gap = span / max(count, 1) * 0.95
+        timestamp = end - span
+        no_group = options['no_group_share'] if groups else 1
+        random = rng.random
+        expovariate = rng.expovariate
+        fromtimestamp = datetime.datetime.fromtimestamp
+        utc = datetime.timezone.utc
+        for _ in range(count):
+            timestamp = min(timestamp + expovariate(1) * mean_gap, end)
+            yield (
+                texts[int(random() * TEXT_POOL)],
+                fromtimestamp(timestamp, utc),
+                pick_author(),
+                pick_group() if random() >= no_group else None,
+            )
+
+    def power_law(self, rng, items, skew):
+        """Chooser that returns the n-th item with weight 1 / n ** skew."""
+        weights = list(itertools.accumulate(
+            1 / rank ** skew for rank in range(1, len(items) + 1)))
+        total = weights[-1] if weights else 0
+        random = rng.random
+
+        def pick():
+            return items[bisect.bisect(weights, random() * total)]
+
+        return pick
+
+    def text(self, rng):
+        # Most posts are short, a few are long.
+        words = min(int(rng.expovariate(1 / 15)) + 1, 200)
+        return ' '.join(rng.choices(WORDS, k=words)).capitalize()
@@ -0,0 +1,84 @@
+import datetime
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from posts.bulk import insert_posts, posts_written
+from posts.models import Group, User
+
+
+class Command(BaseCommand):
+    help = 'Загружает записи из JSONL, созданного export_posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'input', nargs='?', default='-',
+            help='Файл для загрузки, по умолчанию stdin')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        self.authors = dict(User.objects.values_list('username', 'pk'))
+        self.groups = dict(Group.objects.values_list('slug', 'pk'))
+        self.author_ids = set()
+        self.group_ids = set()
+        source = (
+            sys.stdin if options['input'] == '-'
+            else open(options['input'], encoding='utf-8')
+        )
+        start = time.perf_counter()
+        try:
+            with transaction.atomic():
+                count = insert_posts(
+                    self.read_rows(source), options['batch_size'])
+                posts_written(self.author_ids, self.group_ids)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено записей: {count} '
+            f'({count / elapsed if elapsed else 0:.0f} в секунду)'
+        ))
+
+    def read_rows(self, source):
+        for line_number, line in enumerate(source, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+                yield (
+                    row['text'],
+                    self.pub_date(row.get('pub_date')),
+                    self.author_id(row['author']),
+                    self.group_id(row.get('group')),
+                )
+            except (ValueError, KeyError, TypeError) as error:
+                raise CommandError(f'Строка {line_number}: {error!r}')
+
+    def pub_date(self, value):
+        if not value:
+            return timezone.now()
+        pub_date = datetime.datetime.fromisoformat(value)
+        if timezone.is_naive(pub_date):
+            pub_date = timezone.make_aware(pub_date, timezone.utc)
+        return pub_date
+
+    def author_id(self, username):
+        if username not in self.authors:
+            self.authors[username] = User.objects.create(
+                username=username).pk
+        self.author_ids.add(self.authors[username])
+        return self.authors[username]
+
+    def group_id(self, slug):
+        if not slug:
+            return None
+        if slug not in self.groups:
+            self.groups[slug] = Group.objects.create(
+                title=slug, slug=slug).pk
+        self.group_ids.add(self.groups[slug])
+        return self.groups[slug]
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from posts.search import create_search_index
+
+
+class Command(BaseCommand):
+    help = 'Пересоздаёт полнотекстовый индекс записей'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Полнотекстовый индекс есть только в SQLite')
+        create_search_index(connection)
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен'))
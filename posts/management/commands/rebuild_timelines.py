@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.timeline import rebuild_timelines
+
+
+class Command(BaseCommand):
+    help = (
+        'Заново заполняет ленты подписок, например после import_posts '
+        'или generate_fixtures'
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_timelines()
+        self.stdout.write(self.style.SUCCESS('Ленты подписок заполнены'))
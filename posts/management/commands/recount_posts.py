@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.archive import rebuild_archive
+from posts.counters import recount_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает счётчики записей и подписок авторов и групп '
+        'и число записей по месяцам'
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            recount_posts()
+            rebuild_archive()
+        self.stdout.write(self.style.SUCCESS('Счётчики записей пересчитаны'))
@@ -0,0 +1,71 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from posts.queue import claim, run_batch
+
+
+def run_in_thread(name, tasks):
+    try:
+        return run_batch(name, tasks)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = 'Выполняет отложенные задачи из очереди posts_task'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads', type=int, default=4,
+            help='Сколько пачек задач выполнять одновременно'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Сколько задач одного типа передавать обработчику за раз'
+        )
+        parser.add_argument(
+            '--poll', type=float, default=1.0,
+            help='Пауза в секундах, когда очередь пуста'
+        )
+        parser.add_argument(
+            '--lease', type=int, default=300,
+            help='Через сколько секунд задачу упавшего обработчика '
+                 'возьмёт другой'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить всё, что есть в очереди, и выйти'
+        )
+
+    def handle(self, *args, **options):
+        threads = options['threads']
+        batch_size = options['batch_size']
+        lease = timedelta(seconds=options['lease'])
+        done = failed = 0
+        with ThreadPoolExecutor(
+                max_workers=threads, thread_name_prefix='tasks') as executor:
+            while True:
+                claimed = claim(batch_size * threads, lease)
+                if not claimed:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll'])
+                    continue
+                futures = [
+                    (len(chunk), executor.submit(run_in_thread, name, chunk))
+                    for name, tasks in claimed.items()
+                    for chunk in (
+                        tasks[start:start + batch_size]
+                        for start in range(0, len(tasks), batch_size)
+                    )
+                ]
+                for size, future in futures:
+                    succeeded = future.result()
+                    done += succeeded
+                    failed += size - succeeded
+        self.stdout.write(self.style.SUCCESS(
+            f'Выполнено задач: {done}, с ошибкой: {failed}'))
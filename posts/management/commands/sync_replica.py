@@ -0,0 +1,31 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу SQLite в базы-реплики для локальной проверки'
+    )
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError(
+                'Реплики не настроены, задайте YATUBE_REPLICA_DB')
+        primary = connections['default'].settings_dict
+        for alias in settings.DATABASE_REPLICAS:
+            replica = connections[alias].settings_dict
+            if 'sqlite3' not in replica['ENGINE']:
+                raise CommandError(f'{alias}: поддерживается только SQLite')
+            connections[alias].close()
+            source = sqlite3.connect(primary['NAME'])
+            target = sqlite3.connect(replica['NAME'])
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+                source.close()
+            self.stdout.write(self.style.SUCCESS(
+                f'{alias}: скопировано из {primary["NAME"]}'))
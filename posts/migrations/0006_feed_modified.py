@@ -0,0 +1,23 @@
+# Generated by Django 2.2.6 on 2026-10-18 04:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, verbose_name='изменено'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='изменено'),
+        ),
+    ]
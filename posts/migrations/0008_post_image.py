@@ -0,0 +1,31 @@
+# Generated by Django 2.2.6 on 2026-10-18 05:18
+
+from django.db import migrations, models
+
+from posts.search import create_search_index
+
+
+def restore_search_index(apps, schema_editor):
+    # SQLite rebuilds posts_post for AddField, dropping the triggers.
+    create_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_follow_timeline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, help_text='Уменьшенные копии создаются в фоне после загрузки', null=True, upload_to='posts/', verbose_name='Картинка'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='thumbnails',
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(restore_search_index, restore_search_index),
+    ]
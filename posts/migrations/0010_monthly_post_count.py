@@ -0,0 +1,34 @@
+# Generated by Django 2.2.6 on 2026-10-18 05:37
+
+from django.db import migrations, models
+
+from posts.archive import REBUILD_SQL
+
+
+def fill_monthly_counts(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(REBUILD_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyPostCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=50)),
+                ('month', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='monthlypostcount',
+            constraint=models.UniqueConstraint(fields=('scope', 'month'), name='unique_scope_month'),
+        ),
+        migrations.RunPython(fill_monthly_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.6 on 2026-10-18 05:39
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def fill_last_posts(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    Post = apps.get_model('posts', 'Post')
+    latest = Post.objects.filter(group=OuterRef('pk')).order_by(
+        '-pub_date', '-id').values('pk')[:1]
+    Group.objects.update(last_post=Subquery(latest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_monthly_post_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='last_post',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='posts.Post', verbose_name='последняя запись'),
+        ),
+        migrations.RunPython(fill_last_posts, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,24 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils.text import Truncator
 
 User = get_user_model()
 
+FEED_TEXT_LENGTH = 300
+# Characters of the latest post shown in the group directory.
+SNIPPET_LENGTH = 150
+
+
+class PostQuerySet(models.QuerySet):
+    def feed(self):
+        """Posts for the feed pages: one query per page, text cut short."""
+        # extra() rather than annotate(): COUNT(*) over an annotated queryset
+        # turns into a GROUP BY subquery.
+        return self.select_related('author', 'group').defer('text').extra(
+            select={'text_head': 'SUBSTR(posts_post.text, 1, %s)'},
+            select_params=(FEED_TEXT_LENGTH + 1,)
+        )
+
 
 class Post(models.Model):
     text = models.TextField(
@@ -18,18 +34,190 @@ class Post(models.Model):
         related_name='posts', verbose_name='Группа',
         help_text='Укажите, какой группе принадлежит произведение'
     )
+    image = models.ImageField(
+        'Картинка', upload_to='posts/', blank=True, null=True,
+        help_text='Уменьшенные копии создаются в фоне после загрузки'
+    )
+    # JSON with the URL of every thumbnail size, see posts.thumbnails.
+    thumbnails = models.TextField(editable=False, blank=True, null=True)
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'), name='post_pub_date_idx'),
+            models.Index(
+                fields=('group', '-pub_date', '-id'),
+                name='post_group_pub_date_idx'),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_pub_date_idx'),
+        )
 
     def __str__(self):
-        return self.text[:15]
+        # text_preview, as feed() querysets defer the text.
+        return self.text_preview[:15]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_group_id = instance.__dict__.get('group_id')
+        return instance
+
+    @property
+    def text_preview(self):
+        head = getattr(self, 'text_head', None)
+        if head is None:
+            return self.text
+        return Truncator(head).chars(FEED_TEXT_LENGTH)
+
+
+class GroupQuerySet(models.QuerySet):
+    def directory(self):
+        """Groups with their latest post, text cut short, in one query."""
+        return self.select_related('last_post').defer(
+            'last_post__text'
+        ).extra(
+            select={'last_post_head': 'SUBSTR(posts_post.text, 1, %s)'},
+            select_params=(SNIPPET_LENGTH + 1,)
+        )
 
 
 class Group(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(unique=True)
     description = models.TextField(blank=True)
+    post_count = models.PositiveIntegerField(
+        'число записей', default=0, editable=False)
+    # Kept by posts.counters along with post_count.
+    last_post = models.ForeignKey(
+        Post, on_delete=models.SET_NULL, null=True, editable=False,
+        related_name='+', verbose_name='последняя запись')
+    modified = models.DateTimeField('изменено', auto_now=True)
+
+    objects = GroupQuerySet.as_manager()
 
     def __str__(self):
         return self.title
+
+    @property
+    def last_post_preview(self):
+        head = getattr(self, 'last_post_head', None)
+        if head is None:
+            return self.last_post.text
+        return Truncator(head).chars(SNIPPET_LENGTH)
+
+
+class Profile(models.Model):
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, related_name='profile')
+    post_count = models.PositiveIntegerField('число записей', default=0)
+    follower_count = models.PositiveIntegerField(
+        'число подписчиков', default=0)
+    following_count = models.PositiveIntegerField('число подписок', default=0)
+    modified = models.DateTimeField('изменено', auto_now=True, db_index=True)
+
+    def __str__(self):
+        return str(self.user)
+
+
+class Follow(models.Model):
+    # Lookups by user are served by the unique constraint, by author by the
+    # index below.
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='follower',
+        db_index=False, verbose_name='Подписчик')
+    author = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='following',
+        db_index=False, verbose_name='Автор')
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'author'), name='unique_follow'),
+        )
+        indexes = (
+            models.Index(
+                fields=('author', 'user'), name='follow_author_user_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.user} → {self.author}'
+
+
+class TimelineEntry(models.Model):
+    """A post delivered to a follower's feed when it was written.
+
+    ``pub_date`` and ``author`` are copies from the post, so a page of the
+    feed is read from the index below without joining posts.
+    """
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='+', db_index=False)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='+')
+    author = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='+', db_index=False)
+    pub_date = models.DateTimeField()
+
+    class Meta:
+        # Tasks may run twice; deliveries are inserted OR IGNORE.
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'post'), name='unique_timeline_entry'),
+        )
+        indexes = (
+            models.Index(
+                fields=('user', '-pub_date', '-post'),
+                name='timeline_user_pub_date_idx'),
+        )
+
+
+class FollowerNotification(models.Model):
+    """Followers of the author were emailed about the post.
+
+    Written with the emails, so a task run again does not resend them.
+    """
+    post = models.OneToOneField(
+        Post, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+
+class Task(models.Model):
+    """A deferred side effect waiting for ``run_worker``; see posts.queue.
+    """
+    name = models.CharField(max_length=100)
+    # JSON-encoded keyword arguments of the handler.
+    payload = models.TextField()
+    run_at = models.DateTimeField()
+    attempts = models.PositiveIntegerField(default=0)
+    # Set while a worker runs the task; an expired lease is run again.
+    locked_until = models.DateTimeField(null=True)
+    claimed_by = models.CharField(max_length=32, blank=True)
+    failed = models.BooleanField(default=False)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = (
+            models.Index(fields=('run_at',), name='task_run_at_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.name} {self.payload}'
+
+
+class MonthlyPostCount(models.Model):
+    """Posts per UTC month of the site, a group or an author.
+
+    Kept up to date by the post signals; see posts.archive.
+    """
+    # 'index', 'group:<id>' or 'author:<id>'.
+    scope = models.CharField(max_length=50)
+    month = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('scope', 'month'), name='unique_scope_month'),
+        )
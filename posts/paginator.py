@@ -0,0 +1,259 @@
+import base64
+import binascii
+
+from django.conf import settings
+from django.core.paginator import (EmptyPage, InvalidPage, Page,
+                                   PageNotAnInteger, Paginator)
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+CURSOR_ORDERING = ('-pub_date', '-id')
+# Rows a page may skip with OFFSET when the total is not counted. Pages
+# beyond are reached only through the cursors of their neighbours.
+MAX_OFFSET = 1000
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+def encode_cursor(post):
+    raw = f'{post.pub_date.isoformat()}|{post.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        pub_date, pk = raw.decode().rsplit('|', 1)
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor('Некорректный курсор страницы')
+    if pub_date is None:
+        raise InvalidCursor('Некорректный курсор страницы')
+    return pub_date, pk
+
+
+def page_key(number, per_page, after=None, before=None):
+    """Fragment cache key of a requested page, ``''`` if it is not valid.
+
+    Built from the parsed page number and decoded cursor, so query strings
+    that name the same page share one entry. Pages that ``get_page`` would
+    replace with another one are left uncached.
+    """
+    try:
+        number = int(number or 1)
+    except (TypeError, ValueError):
+        return ''
+    if number < 1:
+        return ''
+    if before or after:
+        try:
+            pub_date, pk = decode_cursor(before or after)
+        except InvalidCursor:
+            return ''
+        direction = 'before' if before else 'after'
+        return f'{number}:{direction}:{pub_date.isoformat()}:{pk}'
+    if (number - 1) * per_page > MAX_OFFSET:
+        return ''
+    return str(number)
+
+
+class CursorPage(Page):
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self.number > 1
+
+    def next_page_number(self):
+        if not self.has_next():
+            raise EmptyPage('Это последняя страница')
+        return self.number + 1
+
+    def previous_page_number(self):
+        if not self.has_previous():
+            raise EmptyPage('Это первая страница')
+        return self.number - 1
+
+    def start_index(self):
+        if not self.object_list:
+            return 0
+        return (self.number - 1) * self.paginator.per_page + 1
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1
+
+    @property
+    def next_cursor(self):
+        if self.has_next() and self.object_list:
+            return encode_cursor(self.object_list[-1])
+        return ''
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous() and self.object_list:
+            return encode_cursor(self.object_list[0])
+        return ''
+
+
+def keyset_slice(queryset, fields, per_page, number, after=None,
+                 before=None):
+    """Rows of a page of ``queryset`` ordered descending by ``fields``.
+
+    ``fields`` name the post's ``pub_date`` and ``id`` in the queryset. One
+    lookahead row is fetched after the page; with ``before`` the rows come
+    in reverse order and there is no lookahead row.
+    """
+    date_field, id_field = fields
+    if before:
+        pub_date, pk = decode_cursor(before)
+        return queryset.reverse().filter(
+            Q(**{f'{date_field}__gte': pub_date}),
+            Q(**{f'{date_field}__gt': pub_date}) | Q(**{f'{id_field}__gt': pk})
+        )[:per_page]
+    if after:
+        pub_date, pk = decode_cursor(after)
+        return queryset.filter(
+            Q(**{f'{date_field}__lte': pub_date}),
+            Q(**{f'{date_field}__lt': pub_date}) | Q(**{f'{id_field}__lt': pk})
+        )[:per_page + 1]
+    bottom = (number - 1) * per_page
+    return queryset[bottom:bottom + per_page + 1]
+
+
+class CursorPaginator(Paginator):
+    """Keyset pagination over ``(pub_date, id)``.
+
+    Neighbouring pages are fetched with ``WHERE (pub_date, id) < cursor``
+    instead of ``OFFSET``, so their cost does not depend on the page number.
+    With ``approximate_count=True`` no ``COUNT(*)`` is ever issued: the total
+    is a lower bound derived from the rows fetched for the current page, and
+    pages past ``MAX_OFFSET`` rows need a cursor.
+    """
+    # Fields of object_list holding the post's pub_date and id.
+    cursor_fields = ('pub_date', 'id')
+
+    def __init__(self, object_list, per_page, orphans=0,
+                 allow_empty_first_page=True, approximate_count=False):
+        super().__init__(
+            object_list.order_by(
+                *(f'-{field}' for field in self.cursor_fields)),
+            per_page,
+            orphans=orphans, allow_empty_first_page=allow_empty_first_page
+        )
+        self.approximate_count = approximate_count
+        self._seen = 0
+
+    @cached_property
+    def count(self):
+        if self.approximate_count:
+            return self._seen
+        return super().count
+
+    def validate_number(self, number):
+        if not self.approximate_count:
+            return super().validate_number(number)
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Номер страницы должен быть целым числом')
+        if number < 1:
+            raise EmptyPage('Номер страницы меньше 1')
+        return number
+
+    def slice_queryset(self, number, after=None, before=None):
+        """Return the query that fetches page rows plus one lookahead row.
+
+        With ``before`` the rows come in reverse order and there is no
+        lookahead row.
+        """
+        return keyset_slice(
+            self.object_list, self.cursor_fields, self.per_page, number,
+            after=after, before=before
+        )
+
+    def fetch_rows(self, number, after=None, before=None):
+        return list(self.slice_queryset(number, after=after, before=before))
+
+    def page_objects(self, rows):
+        """Turn the fetched rows into the objects shown on the page."""
+        return rows
+
+    def page(self, number, after=None, before=None):
+        number = self.validate_number(number)
+        if (self.approximate_count and not (after or before)
+                and (number - 1) * self.per_page > MAX_OFFSET):
+            # Nothing else bounds the OFFSET without a count.
+            raise EmptyPage('Страница слишком далеко от начала')
+        rows = self.fetch_rows(number, after=after, before=before)
+        if before:
+            if len(rows) < self.per_page:
+                return self.page(1)
+            rows.reverse()
+            rows.append(None)
+        has_next = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not rows and number > 1:
+            raise EmptyPage('На этой странице нет записей')
+        if self.approximate_count:
+            self._seen = (number - 1) * self.per_page + len(rows) + has_next
+            self.__dict__.pop('count', None)
+            self.__dict__.pop('num_pages', None)
+        return CursorPage(self.page_objects(rows), number, self, has_next)
+
+    def get_page(self, number, after=None, before=None):
+        try:
+            return self.page(number or 1, after=after, before=before)
+        except InvalidCursor:
+            return self.page(1)
+        except PageNotAnInteger:
+            return self.page(1)
+        except EmptyPage:
+            if self.approximate_count:
+                return self.page(1)
+            return self.page(self.num_pages)
+
+
+def table_row_estimate(model, using='default'):
+    """Row count of ``model``'s table from the last ``ANALYZE``, if any."""
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        if cursor.fetchone() is None:
+            return None
+        cursor.execute(
+            'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+            [model._meta.db_table])
+        row = cursor.fetchone()
+    return int(row[0].split()[0]) if row else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that counts at most ``ADMIN_COUNT_LIMIT`` rows.
+
+    Up to the limit the count is exact. Past it an unfiltered list takes the
+    row count from SQLite statistics, and a filtered one reports the limit
+    itself, so its last pages are out of reach until the filter is narrowed.
+    """
+    @cached_property
+    def count(self):
+        limit = settings.ADMIN_COUNT_LIMIT
+        queryset = self.object_list
+        count = queryset.order_by().values('pk')[:limit].count()
+        if count < limit or queryset.query.has_filters():
+            return count
+        estimate = table_row_estimate(queryset.model, queryset.db)
+        return max(count, estimate or 0)
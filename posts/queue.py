@@ -0,0 +1,98 @@
+"""A small persistent task queue in the ``posts_task`` table.
+
+``enqueue`` stores a task once the current transaction commits, so nothing
+is queued for writes that were rolled back. The ``run_worker`` command
+claims due tasks, hands every batch of tasks of one type to its handler in
+a single call on a thread pool, deletes the tasks that succeeded and
+retries failed ones with exponential backoff, up to ``TASKS_MAX_ATTEMPTS``
+times. The tasks of a failed batch run again one by one first, so one bad
+payload does not hold back the rest.
+
+With ``TASKS_ALWAYS_EAGER`` handlers run right away in the caller's thread
+and transaction, so tests need no worker. Off by default: a request must
+never wait for image resizing.
+"""
+import json
+import logging
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+
+def handler(name):
+    """Register ``func(payloads)`` to run batches of ``name`` tasks."""
+    def decorator(func):
+        HANDLERS[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, **payload):
+    if settings.TASKS_ALWAYS_EAGER:
+        HANDLERS[name]([payload])
+        return
+    payload = json.dumps(payload)
+    transaction.on_commit(lambda: Task.objects.create(
+        name=name, payload=payload, run_at=timezone.now()))
+
+
+def claim(limit, lease):
+    """Lock up to ``limit`` due tasks for ``lease``; return them by name."""
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    due = Task.objects.filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now),
+        failed=False, run_at__lte=now,
+    ).order_by('run_at')
+    Task.objects.filter(pk__in=due.values('pk')[:limit]).update(
+        locked_until=now + lease, claimed_by=token)
+    batches = defaultdict(list)
+    for task in Task.objects.filter(claimed_by=token).order_by('pk'):
+        batches[task.name].append(task)
+    return batches
+
+
+def run_batch(name, tasks):
+    """Run tasks of one type together; return how many succeeded."""
+    try:
+        # A failed batch leaves nothing behind to be repeated on retry.
+        with transaction.atomic():
+            HANDLERS[name]([json.loads(task.payload) for task in tasks])
+    except Exception as error:
+        if len(tasks) > 1:
+            logger.warning(
+                'Пачка задач %s завершилась с ошибкой, выполняем по одной',
+                name)
+            return sum(run_batch(name, [task]) for task in tasks)
+        logger.exception('Задачи %s завершились с ошибкой', name)
+        retry_later(tasks, error)
+        return 0
+    Task.objects.filter(pk__in=[task.pk for task in tasks]).delete()
+    return len(tasks)
+
+
+def retry_later(tasks, error):
+    now = timezone.now()
+    for task in tasks:
+        task.attempts += 1
+        task.failed = task.attempts >= settings.TASKS_MAX_ATTEMPTS
+        task.run_at = now + timedelta(
+            seconds=settings.TASKS_RETRY_DELAY * 2 ** (task.attempts - 1))
+        task.locked_until = None
+        task.claimed_by = ''
+        task.last_error = repr(error)
+    Task.objects.bulk_update(tasks, (
+        'attempts', 'failed', 'run_at', 'locked_until', 'claimed_by',
+        'last_error',
+    ))
@@ -0,0 +1,151 @@
+"""Full-text search over ``Post.text`` backed by an SQLite FTS5 table.
+
+``posts_post_fts`` is an external-content index of ``posts_post`` kept in
+sync by triggers, so bulk inserts and raw SQL are indexed as well. Django
+rebuilds a SQLite table when a migration alters it, which drops the
+triggers: such migrations must call ``create_search_index`` again.
+"""
+import contextlib
+import re
+
+from django.db import connection
+
+from .models import Post
+
+FTS_TABLE = 'posts_post_fts'
+
+CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"text, content='posts_post', content_rowid='id')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert "
+    f"AFTER INSERT ON posts_post BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete "
+    f"AFTER DELETE ON posts_post BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) "
+    f"VALUES ('delete', old.id, old.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update "
+    f"AFTER UPDATE OF text ON posts_post BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) "
+    f"VALUES ('delete', old.id, old.text); "
+    f"INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+)
+
+DROP_SQL = (
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_update',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+)
+
+# FTS5 cannot parse a query with NUL or other control characters in it.
+CONTROL_CHARS = re.compile(r'[\x00-\x1f\x7f-\x9f]')
+
+MATCH_SQL = f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+
+
+def create_search_index(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for sql in CREATE_SQL:
+            cursor.execute(sql)
+    rebuild_search_index(connection)
+
+
+def drop_search_index(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for sql in DROP_SQL:
+            cursor.execute(sql)
+
+
+@contextlib.contextmanager
+def search_triggers_suspended(connection=connection):
+    """Index posts inserted inside the block with one statement at the end.
+
+    Per-row triggers make bulk inserts several times slower. Must run
+    inside a transaction, so no other writer can slip posts in unindexed.
+    """
+    if connection.vendor != 'sqlite':
+        yield
+        return
+    if not connection.in_atomic_block:
+        raise RuntimeError('search_triggers_suspended() needs a transaction')
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT COALESCE(MAX(id), 0) FROM posts_post')
+        last_id = cursor.fetchone()[0]
+        cursor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_insert')
+    yield
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE}(rowid, text) '
+            f'SELECT id, text FROM posts_post WHERE id > %s',
+            [last_id]
+        )
+        cursor.execute(CREATE_SQL[1])
+
+
+def rebuild_search_index(connection=connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def match_expression(query):
+    """Turn user input into an FTS5 query: every word is a prefix term."""
+    query = CONTROL_CHARS.sub(' ', query)
+    terms = [word.replace('"', '""') for word in query.split()]
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+class SearchResults:
+    """Sequence of posts ranked by bm25, sliced lazily by ``Paginator``."""
+
+    def __init__(self, query):
+        self.match = match_expression(query)
+
+    def count(self):
+        if not self.match:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT COUNT(*) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s',
+                [self.match]
+            )
+            return cursor.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        if not self.match:
+            return []
+        offset = key.start or 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'{MATCH_SQL} ORDER BY bm25({FTS_TABLE}) LIMIT %s OFFSET %s',
+                [self.match, key.stop - offset, offset]
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        posts = Post.objects.feed().in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
+
+
+def search_posts(query):
+    if connection.vendor != 'sqlite':
+        return Post.objects.feed().filter(text__icontains=query)
+    return SearchResults(query)
+
+
+def filter_by_search(queryset, query):
+    if connection.vendor != 'sqlite':
+        return queryset.filter(text__icontains=query)
+    return queryset.extra(
+        where=[f'{Post._meta.db_table}.id IN ({MATCH_SQL})'],
+        params=[match_expression(query)]
+    )
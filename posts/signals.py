@@ -0,0 +1,119 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .archive import change_month_counts, group_scope, post_scopes
+from .cache import (GROUPS_FEED, INDEX_FEED, author_feed, group_feed,
+                    invalidate_feeds, post_feeds)
+from .counters import (change_follow_counts, change_last_posts,
+                       change_post_counts)
+from .models import Follow, Group, Post, Profile, User
+from .queue import enqueue
+from .thumbnails import schedule_thumbnails
+from .timeline import backfill, remove
+
+
+# Shown next to the user's posts on the feed pages.
+NAME_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw=False, update_fields=None,
+               **kwargs):
+    if raw:
+        return
+    if created:
+        Profile.objects.get_or_create(user=instance)
+    # Logins save last_login alone.
+    elif update_fields is None or NAME_FIELDS & set(update_fields):
+        author_renamed(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    # The index shows the user's posts and name; its validator must not
+    # come back to a value it had before.
+    invalidate_feeds([INDEX_FEED])
+
+
+def author_renamed(author_id):
+    group_ids = list(Group.objects.filter(
+        posts__author_id=author_id).values_list('pk', flat=True).distinct())
+    now = timezone.now()
+    Profile.objects.filter(user_id=author_id).update(modified=now)
+    Group.objects.filter(pk__in=group_ids).update(modified=now)
+    invalidate_feeds(
+        [INDEX_FEED, author_feed(author_id)]
+        + [group_feed(pk) for pk in group_ids]
+    )
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    loaded_group_id = getattr(instance, '_loaded_group_id', None)
+    if created:
+        change_post_counts(
+            instance.author_id, instance.group_id, last_post=instance)
+        change_month_counts(
+            post_scopes(instance.author_id, instance.group_id),
+            instance.pub_date)
+        # Counters and feed versions stay in the request: the author's next
+        # page must show the post. Followers can wait for the worker.
+        enqueue('fan_out', post_id=instance.pk)
+        enqueue('notify_followers', post_id=instance.pk)
+    elif (hasattr(instance, '_loaded_group_id')
+          and loaded_group_id != instance.group_id):
+        change_post_counts(instance.author_id, delta=0)
+        change_post_counts(group_id=loaded_group_id, delta=-1)
+        change_post_counts(group_id=instance.group_id)
+        change_last_posts([loaded_group_id, instance.group_id])
+        if loaded_group_id is not None:
+            change_month_counts(
+                [group_scope(loaded_group_id)], instance.pub_date, delta=-1)
+        if instance.group_id is not None:
+            change_month_counts(
+                [group_scope(instance.group_id)], instance.pub_date)
+    else:
+        change_post_counts(instance.author_id, instance.group_id, delta=0)
+    schedule_thumbnails(instance)
+    invalidate_feeds(post_feeds(instance))
+    instance._loaded_group_id = instance.group_id
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    change_post_counts(instance.author_id, instance.group_id, delta=-1)
+    if instance.group_id is not None:
+        change_last_posts([instance.group_id])
+    change_month_counts(
+        post_scopes(instance.author_id, instance.group_id),
+        instance.pub_date, delta=-1)
+    invalidate_feeds(post_feeds(instance))
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_feeds([GROUPS_FEED])
+
+
+@receiver(post_save, sender=Follow)
+def follow_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        change_follow_counts(instance.user_id, instance.author_id)
+        backfill(instance.user_id, instance.author_id)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    change_follow_counts(instance.user_id, instance.author_id, delta=-1)
+    remove(instance.user_id, instance.author_id)
+    # Posts of the author's time above the limit are missing from feeds.
+    if Profile.objects.filter(
+            user_id=instance.author_id,
+            follower_count=settings.FOLLOW_FANOUT_LIMIT - 1).exists():
+        enqueue('refill_timelines', author_id=instance.author_id)
@@ -0,0 +1,64 @@
+"""Handlers of the side effects deferred to the task queue, see posts.queue.
+"""
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.urls import reverse
+
+from .models import Follow, FollowerNotification, Post
+from .queue import enqueue, handler
+from .thumbnails import make_thumbnails, stored_thumbnails
+from .timeline import fan_out, refill
+
+
+@handler('fan_out')
+def fan_out_posts(payloads):
+    posts = Post.objects.filter(
+        pk__in=[payload['post_id'] for payload in payloads])
+    for post in posts:
+        fan_out(post)
+
+
+@handler('refill_timelines')
+def refill_timelines(payloads):
+    for author_id, after in {
+        (payload['author_id'], payload.get('after', 0))
+        for payload in payloads
+    }:
+        # One transaction per batch of followers.
+        after = refill(author_id, after)
+        if after is not None:
+            enqueue('refill_timelines', author_id=author_id, after=after)
+
+
+@handler('notify_followers')
+def notify_followers(payloads):
+    # Authors that big are read at merge time, and not mailed either.
+    posts = list(Post.objects.select_related('author').filter(
+        pk__in=[payload['post_id'] for payload in payloads],
+        author__profile__follower_count__lt=settings.FOLLOW_FANOUT_LIMIT,
+    ).exclude(pk__in=FollowerNotification.objects.values('post')))
+    messages = []
+    for post in posts:
+        emails = Follow.objects.filter(author_id=post.author_id).exclude(
+            user__email='').values_list('user__email', flat=True)
+        subject = f'Новая запись автора {post.author.username}'
+        url = settings.SITE_URL + reverse('posts:post', kwargs={
+            'username': post.author.username, 'post_id': post.pk})
+        body = '\n\n'.join((post.text, url))
+        messages.extend(
+            (subject, body, None, [email]) for email in emails.iterator())
+    # In the batch transaction: undone if sending fails, and a worker
+    # running the same tasks concurrently fails on the primary key.
+    FollowerNotification.objects.bulk_create(
+        FollowerNotification(post=post) for post in posts)
+    # One connection to the mail server for the whole batch.
+    send_mass_mail(messages)
+
+
+@handler('make_thumbnails')
+def make_post_thumbnails(payloads):
+    posts = Post.objects.filter(
+        pk__in=[payload['post_id'] for payload in payloads])
+    for post in posts:
+        if post.image and not stored_thumbnails(post):
+            make_thumbnails(post)
@@ -0,0 +1,47 @@
+from django import template
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+
+register = template.Library()
+
+
+class FeedCacheNode(template.Node):
+    def __init__(self, nodelist, timeout, name, page_key, vary_on):
+        self.nodelist = nodelist
+        self.timeout = timeout
+        self.name = name
+        self.page_key = page_key
+        self.vary_on = vary_on
+
+    def render(self, context):
+        page_key = self.page_key.resolve(context)
+        if not page_key:
+            return self.nodelist.render(context)
+        key = make_template_fragment_key(self.name, [
+            page_key, *(var.resolve(context) for var in self.vary_on)])
+        value = cache.get(key)
+        if value is None:
+            value = self.nodelist.render(context)
+            cache.set(key, value, self.timeout.resolve(context))
+        return value
+
+
+@register.tag
+def feed_cache(parser, token):
+    """``{% feed_cache timeout 'name' page_key [var ...] %}``.
+
+    Like ``{% cache %}``, but the fragment is rendered without the cache
+    when ``page_key`` is empty, so requests for pages that cannot be
+    validated up front add no entries.
+    """
+    nodelist = parser.parse(('endfeed_cache',))
+    parser.delete_first_token()
+    tokens = token.split_contents()
+    if len(tokens) < 4:
+        raise template.TemplateSyntaxError(
+            f'{tokens[0]} требует срок, имя фрагмента и ключ страницы')
+    return FeedCacheNode(
+        nodelist, parser.compile_filter(tokens[1]), tokens[2],
+        parser.compile_filter(tokens[3]),
+        [parser.compile_filter(var) for var in tokens[4:]],
+    )
@@ -0,0 +1,47 @@
+from collections import namedtuple
+
+from django import template
+
+from posts.paginator import MAX_OFFSET
+
+register = template.Library()
+
+# Pages shown on each side of the current one.
+PAGE_WINDOW = 2
+# Rows skipped by the deepest page linked by number. Such links use OFFSET;
+# pages beyond are reached only through the cursors of their neighbours.
+MAX_LINK_OFFSET = MAX_OFFSET
+
+PageLink = namedtuple('PageLink', 'number cursor')
+
+
+@register.simple_tag
+def page_window(page, window=PAGE_WINDOW, max_offset=MAX_LINK_OFFSET):
+    """Links to the first, last and nearby pages; ``None`` marks a gap.
+
+    Only ``num_pages`` of the paginator is used, which cursor pagination
+    with an approximate count knows without counting. Neighbouring pages
+    are linked by cursor when the page has one; pages past ``max_offset``
+    rows without a cursor are left out.
+    """
+    last = page.paginator.num_pages
+    start = max(page.number - window, 1)
+    end = min(page.number + window, last)
+    numbers = list(range(start, end + 1))
+    if start > 1:
+        numbers[:0] = [1] if start == 2 else [1, None]
+    if end < last:
+        numbers += [last] if end == last - 1 else [None, last]
+    links = []
+    for number in numbers:
+        cursor = ''
+        if number == page.number - 1 and getattr(page, 'previous_cursor', ''):
+            cursor = f'&before={page.previous_cursor}'
+        elif number == page.number + 1 and getattr(page, 'next_cursor', ''):
+            cursor = f'&after={page.next_cursor}'
+        if (number and not cursor and number != page.number
+                and (number - 1) * page.paginator.per_page > max_offset):
+            number = None
+        if number or links[-1:] != [None]:
+            links.append(number and PageLink(number, cursor))
+    return links
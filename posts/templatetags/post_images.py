@@ -0,0 +1,11 @@
+from django import template
+
+from posts.thumbnails import thumbnail_url as get_thumbnail_url
+
+register = template.Library()
+
+
+@register.filter
+def thumbnail_url(image, size):
+    """``{{ post.image|thumbnail_url:'feed' }}``, never resizes on render."""
+    return get_thumbnail_url(image, size)
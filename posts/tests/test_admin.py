@@ -0,0 +1,45 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+
+@override_settings(ADMIN_COUNT_LIMIT=3)
+class PostChangelistTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password')
+        group = Group.objects.create(title='Группа', slug='group')
+        for i in range(5):
+            Post.objects.create(
+                text=f'запись {i}', author=cls.admin, group=group)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        self.url = reverse('admin:posts_post_changelist')
+
+    def result_count(self, query=''):
+        return self.client.get(self.url + query).context['cl'].result_count
+
+    def test_changelist_joins_and_never_counts_whole_table(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Группа')
+        counts = [q['sql'] for q in queries if 'COUNT(' in q['sql']]
+        self.assertEqual(len(counts), 1)
+        self.assertIn('LIMIT 3', counts[0])
+        # Authors and groups come with the page, not one query per row.
+        self.assertEqual(
+            len([q for q in queries if 'posts_group' in q['sql']]), 1)
+
+    def test_count_estimated_past_limit(self):
+        self.assertEqual(self.result_count(), 3)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE posts_post')
+        self.assertEqual(self.result_count(), 5)
+        # Filtered lists stop at the limit.
+        self.assertEqual(self.result_count('?q=запись'), 3)
@@ -0,0 +1,77 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.archive import (INDEX_SCOPE, author_scope, group_scope,
+                           month_counts, rebuild_archive)
+from posts.models import Group, MonthlyPostCount, Post
+
+User = get_user_model()
+
+JANUARY = datetime.datetime(2021, 1, 15, tzinfo=datetime.timezone.utc)
+MARCH = datetime.datetime(2021, 3, 31, 23, 59, tzinfo=datetime.timezone.utc)
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='Amalia')
+        self.group = Group.objects.create(title='Группа', slug='group')
+        self.client = Client()
+
+    def post(self, pub_date, **kwargs):
+        with mock.patch('django.utils.timezone.now', return_value=pub_date):
+            return Post.objects.create(
+                text='запись', author=self.author, **kwargs)
+
+    def counts(self, scope):
+        return [(m.month.month, m.count) for m in month_counts(scope)]
+
+    def test_counts_follow_post_writes(self):
+        self.post(JANUARY, group=self.group)
+        moved = self.post(MARCH, group=self.group)
+        removed = self.post(MARCH)
+        moved.group = None
+        moved.save()
+        removed.delete()
+        self.assertEqual(self.counts(INDEX_SCOPE), [(3, 1), (1, 1)])
+        self.assertEqual(
+            self.counts(author_scope(self.author.pk)), [(3, 1), (1, 1)])
+        self.assertEqual(self.counts(group_scope(self.group.pk)), [(1, 1)])
+
+        incremental = set(MonthlyPostCount.objects.filter(
+            count__gt=0).values_list('scope', 'month', 'count'))
+        rebuild_archive()
+        self.assertEqual(
+            set(MonthlyPostCount.objects.values_list(
+                'scope', 'month', 'count')),
+            incremental)
+
+    def test_month_page_lists_month_posts_and_sidebar(self):
+        self.post(JANUARY)
+        march = self.post(MARCH, group=self.group)
+        url = reverse('posts:group_archive', args=('group', 2021, 3))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(list(response.context['page']), [march])
+        self.assertEqual(
+            [(item.month.month, item.count)
+             for item, _ in response.context['months']],
+            [(3, 1)])
+        for query in queries:
+            self.assertNotIn('GROUP BY', query['sql'])
+
+        response = self.client.get(
+            reverse('posts:profile_archive', args=('Amalia', 2021)))
+        self.assertEqual(len(response.context['page']), 2)
+        self.assertContains(response, reverse(
+            'posts:profile_archive', args=('Amalia', 2021, 1)))
+
+    def test_invalid_month_not_found(self):
+        response = self.client.get(
+            reverse('posts:index_archive', args=(2021, 13)))
+        self.assertEqual(response.status_code, 404)
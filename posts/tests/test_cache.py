@@ -0,0 +1,80 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.cache import INDEX_FEED, author_feed, feed_version, group_feed
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class FeedCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Amalia')
+        cls.group = Group.objects.create(title='Группа', slug='group')
+        cls.another_group = Group.objects.create(title='Другая', slug='s')
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(FeedCacheTests.user)
+        self.post = Post.objects.create(
+            text='Первый', author=self.user, group=self.group)
+
+    def test_cached_index_page_runs_no_queries(self):
+        self.guest_client.get(reverse('posts:index'))
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Первый')
+
+    def test_only_validated_pages_are_cached(self):
+        url = reverse('posts:index')
+        self.guest_client.get(url)
+        # The same page under another spelling shares the entry.
+        with self.assertNumQueries(0):
+            self.guest_client.get(url, {'page': '01'})
+        for params in ({'page': 'x'}, {'page': '2', 'after': 'garbage'},
+                       {'page': '999999999'}):
+            with self.subTest(**params):
+                self.guest_client.get(url, params)
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.guest_client.get(url, params)
+                # Rendered again rather than stored under a new key.
+                self.assertTrue(queries)
+                self.assertContains(response, 'Первый')
+
+    def test_new_post_invalidates_index(self):
+        self.guest_client.get(reverse('posts:index'))
+        self.authorized_client.post(
+            reverse('posts:new_post'), data={'text': 'Второй'})
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Второй')
+
+    def test_edit_invalidates_only_post_feeds(self):
+        untouched = feed_version(author_feed(self.user.pk + 1))
+        versions = {
+            feed: feed_version(feed)
+            for feed in (
+                INDEX_FEED,
+                author_feed(self.user.pk),
+                group_feed(self.group.pk),
+                group_feed(self.another_group.pk),
+            )
+        }
+        self.authorized_client.post(
+            reverse(
+                'posts:post_edit',
+                kwargs={'username': 'Amalia', 'post_id': self.post.pk}),
+            data={'text': 'Изменённый', 'group': self.another_group.pk}
+        )
+        for feed, version in versions.items():
+            with self.subTest(feed=feed):
+                self.assertNotEqual(feed_version(feed), version)
+        self.assertEqual(
+            feed_version(author_feed(self.user.pk + 1)), untouched)
@@ -0,0 +1,88 @@
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from posts.models import Group, Post, User
+from posts.search import search_posts
+
+
+class ExplainFeedsCommandTests(TestCase):
+    def test_feed_queries_use_indexes(self):
+        out = StringIO()
+        call_command('explain_feeds', stdout=out)
+        self.assertIn('post_group_pub_date_idx', out.getvalue())
+        self.assertIn('post_author_pub_date_idx', out.getvalue())
+        self.assertNotIn('USE TEMP B-TREE', out.getvalue())
+
+
+class ImportExportCommandTests(TestCase):
+    def test_round_trip_keeps_posts_and_counters(self):
+        author = User.objects.create_user(username='Amalia')
+        group = Group.objects.create(title='Группа', slug='group')
+        Post.objects.create(text='первая запись', author=author, group=group)
+        Post.objects.create(text='вторая запись', author=author)
+        exported = list(
+            Post.objects.order_by('pk').values_list('text', 'pub_date'))
+        path = self.tmp_path()
+        call_command('export_posts', path, stderr=StringIO())
+        Post.objects.all().delete()
+        call_command('import_posts', path, stdout=StringIO())
+        self.assertEqual(
+            list(Post.objects.order_by('pk').values_list('text', 'pub_date')),
+            exported
+        )
+        author.profile.refresh_from_db()
+        group.refresh_from_db()
+        self.assertEqual(author.profile.post_count, 2)
+        self.assertEqual(group.post_count, 1)
+        self.assertEqual(search_posts('первая').count(), 1)
+
+    def tmp_path(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return os.path.join(directory.name, 'posts.jsonl')
+
+
+class GenerateFixturesCommandTests(TestCase):
+    def generate(self):
+        call_command(
+            'generate_fixtures', '--end=2021-01-31', users=20, groups=3,
+            posts=500, seed=7, stdout=StringIO(), stderr=StringIO())
+        return list(Post.objects.order_by('pk').values_list(
+            'text', 'pub_date', 'author__username', 'group__slug'))
+
+    def test_dataset_is_skewed_and_repeatable(self):
+        posts = self.generate()
+        self.assertEqual(len(posts), 500)
+        top = User.objects.get(username='user_0')
+        last = User.objects.get(username='user_19')
+        self.assertGreater(top.profile.post_count, last.profile.post_count)
+        self.assertTrue(any(group is None for *_, group in posts))
+        self.assertEqual(
+            sorted(posts, key=lambda post: post[1]), posts)
+        Post.objects.all().delete()
+        self.assertEqual(self.generate(), posts)
+
+
+class ClearSessionsCommandTests(TestCase):
+    def test_expired_sessions_deleted_in_chunks(self):
+        now = timezone.now()
+        for i in range(5):
+            Session.objects.create(
+                session_key=f'expired{i}', session_data='',
+                expire_date=now - timedelta(days=1))
+        Session.objects.create(
+            session_key='active', session_data='',
+            expire_date=now + timedelta(days=1))
+        out = StringIO()
+        call_command(
+            'clearsessions', '--chunk-size=2', '--pause=0', stdout=out)
+        self.assertIn('5', out.getvalue())
+        self.assertQuerysetEqual(
+            Session.objects.all(), ['active'], lambda s: s.session_key)
@@ -0,0 +1,94 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Amalia')
+        cls.group = Group.objects.create(title='Группа', slug='group')
+        cls.post = Post.objects.create(
+            text='Первый', author=cls.user, group=cls.group)
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.urls = [
+            reverse('posts:index'),
+            reverse('posts:group', kwargs={'slug': 'group'}),
+            reverse('posts:profile', kwargs={'username': 'Amalia'}),
+            reverse(
+                'posts:post',
+                kwargs={'username': 'Amalia', 'post_id': self.post.pk}),
+        ]
+
+    def revalidate(self, url, response):
+        return self.guest_client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_unchanged_pages_return_not_modified(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                # The index is validated by its feed version in the cache.
+                with self.assertNumQueries(0 if url == self.urls[0] else 1):
+                    repeated = self.revalidate(url, response)
+                self.assertEqual(repeated.status_code, 304)
+
+    def test_new_post_changes_validators(self):
+        responses = {url: self.guest_client.get(url) for url in self.urls}
+        Post.objects.create(text='Второй', author=self.user, group=self.group)
+        for url, response in responses.items():
+            with self.subTest(url=url):
+                self.assertEqual(self.revalidate(url, response).status_code,
+                                 200)
+
+    def test_deleting_user_changes_index_validator(self):
+        other = User.objects.create_user(username='Leo')
+        Post.objects.create(text='Чужой', author=other)
+        # The remaining author has the newest modified time.
+        Post.objects.create(text='Второй', author=self.user)
+        url = reverse('posts:index')
+        response = self.guest_client.get(url)
+        other.delete()
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_no_last_modified(self):
+        # One-second resolution; a post in the same second would be missed.
+        for url in self.urls:
+            with self.subTest(url=url):
+                self.assertFalse(
+                    self.guest_client.get(url).has_header('Last-Modified'))
+
+    def test_renaming_author_changes_validators(self):
+        responses = {url: self.guest_client.get(url) for url in self.urls}
+        self.user.first_name = 'Амалия'
+        self.user.save()
+        for url, response in responses.items():
+            with self.subTest(url=url):
+                repeated = self.revalidate(url, response)
+                self.assertEqual(repeated.status_code, 200)
+        self.assertContains(self.guest_client.get(self.urls[0]), 'Амалия')
+
+    def test_login_keeps_validators(self):
+        response = self.guest_client.get(self.urls[0])
+        self.user.save(update_fields=['last_login'])
+        self.assertEqual(
+            self.revalidate(self.urls[0], response).status_code, 304)
+
+    def test_validators_differ_between_users(self):
+        response = self.guest_client.get(self.urls[0])
+        authorized_client = Client()
+        authorized_client.force_login(self.user)
+        repeated = authorized_client.get(
+            self.urls[0], HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(repeated.status_code, 200)
+
+    def test_missing_group_still_returns_not_found(self):
+        response = self.guest_client.get(
+            reverse('posts:group', kwargs={'slug': 'missing'}))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,64 @@
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from posts.models import Group, Post, Profile
+
+User = get_user_model()
+
+
+class PostCountersTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='Amalia')
+        self.group = Group.objects.create(title='Группа', slug='group')
+        self.another_group = Group.objects.create(title='Другая', slug='s')
+        self.post = Post.objects.create(
+            text='a', author=self.user, group=self.group)
+
+    def assertCounts(self, author, group, another_group):
+        self.user.profile.refresh_from_db()
+        self.group.refresh_from_db()
+        self.another_group.refresh_from_db()
+        self.assertEqual(self.user.profile.post_count, author)
+        self.assertEqual(self.group.post_count, group)
+        self.assertEqual(self.another_group.post_count, another_group)
+
+    def test_create_increments_counters(self):
+        Post.objects.create(text='b', author=self.user)
+        self.assertCounts(2, 1, 0)
+
+    def test_group_change_moves_counter(self):
+        post = Post.objects.get(pk=self.post.pk)
+        post.group = self.another_group
+        post.save()
+        self.assertCounts(1, 0, 1)
+
+    def test_delete_decrements_counters(self):
+        Post.objects.get(pk=self.post.pk).delete()
+        self.assertCounts(0, 0, 0)
+
+    def test_deleting_author_leaves_no_profile(self):
+        self.user.delete()
+        self.assertFalse(Profile.objects.exists())
+
+    def test_recount_posts_repairs_drift(self):
+        Profile.objects.update(post_count=10)
+        Group.objects.update(post_count=10)
+        Profile.objects.filter(user=self.user).delete()
+        call_command('recount_posts', stdout=StringIO())
+        self.user = User.objects.get(pk=self.user.pk)
+        self.assertCounts(1, 1, 0)
+
+    def test_migration_creates_profiles_in_safe_batches(self):
+        # SQLite caps a compound SELECT at 500 terms.
+        User.objects.bulk_create(
+            User(username=f'user{number}') for number in range(600))
+        Profile.objects.all().delete()
+        migration = import_module('posts.migrations.0004_post_counters')
+        migration.fill_counters(apps, None)
+        self.assertEqual(Profile.objects.count(), 601)
+        self.assertEqual(Profile.objects.get(user=self.user).post_count, 1)
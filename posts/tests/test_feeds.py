@@ -0,0 +1,55 @@
+from xml.etree import ElementTree
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class RssFeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Amalia')
+        cls.group = Group.objects.create(title='Группа', slug='group')
+        cls.post = Post.objects.create(
+            text='Первый <b>', author=cls.user, group=cls.group)
+        Post.objects.create(text='Второй', author=cls.user)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def items(self, url):
+        response = self.guest_client.get(url)
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response['Content-Type'], 'application/rss+xml; charset=utf-8')
+        root = ElementTree.fromstring(b''.join(response.streaming_content))
+        return [item.findtext('description') for item in root.iter('item')]
+
+    def test_feeds_list_newest_posts(self):
+        feeds = {
+            reverse('posts:index_rss'): ['Второй', 'Первый <b>'],
+            reverse('posts:group_rss', kwargs={'slug': 'group'}):
+                ['Первый <b>'],
+            reverse('posts:profile_rss', kwargs={'username': 'Amalia'}):
+                ['Второй', 'Первый <b>'],
+        }
+        for url, texts in feeds.items():
+            with self.subTest(url=url):
+                self.assertEqual(self.items(url), texts)
+
+    def test_unchanged_feed_returns_not_modified(self):
+        url = reverse('posts:index_rss')
+        response = self.guest_client.get(url)
+        response = self.guest_client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_unknown_group_feed_returns_404(self):
+        response = self.guest_client.get(
+            reverse('posts:group_rss', kwargs={'slug': 'missing'}))
+        self.assertEqual(response.status_code, 404)
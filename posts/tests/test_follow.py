@@ -0,0 +1,119 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Follow, Post, TimelineEntry
+from posts.paginator import encode_cursor
+from posts.timeline import TimelinePaginator
+
+User = get_user_model()
+
+
+@override_settings(TASKS_ALWAYS_EAGER=True)
+class FollowTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='Amalia')
+        self.author = User.objects.create_user(username='Leo')
+        self.stranger = User.objects.create_user(username='Ivan')
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def follow(self, username='Leo'):
+        self.client.get(
+            reverse('posts:profile_follow', kwargs={'username': username}))
+
+    def feed(self, **params):
+        return list(self.client.get(
+            reverse('posts:follow_index'), params).context['page'])
+
+    def test_follow_and_unfollow_update_counters(self):
+        self.follow()
+        self.follow()
+        self.follow('Amalia')
+        self.author.profile.refresh_from_db()
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.author.profile.follower_count, 1)
+        self.assertEqual(self.user.profile.following_count, 1)
+        self.client.get(
+            reverse('posts:profile_unfollow', kwargs={'username': 'Leo'}))
+        self.author.profile.refresh_from_db()
+        self.assertEqual(self.author.profile.follower_count, 0)
+        self.assertFalse(Follow.objects.exists())
+
+    def test_new_post_is_delivered_to_followers_only(self):
+        self.follow()
+        post = Post.objects.create(text='Новая', author=self.author)
+        Post.objects.create(text='Чужая', author=self.stranger)
+        self.assertEqual(self.feed(), [post])
+        self.assertTrue(
+            TimelineEntry.objects.filter(user=self.user, post=post).exists())
+
+    def test_follow_backfills_and_unfollow_clears_feed(self):
+        post = Post.objects.create(text='Старая', author=self.author)
+        self.follow()
+        self.assertEqual(self.feed(), [post])
+        self.client.get(
+            reverse('posts:profile_unfollow', kwargs={'username': 'Leo'}))
+        self.assertEqual(self.feed(), [])
+
+    @override_settings(FOLLOW_FANOUT_LIMIT=2)
+    def test_celebrity_posts_are_merged_on_read(self):
+        Follow.objects.create(user=self.user, author=self.stranger)
+        Follow.objects.create(user=self.stranger, author=self.stranger)
+        self.follow()
+        posts = []
+        for i in range(5):
+            posts.append(Post.objects.create(text=str(i), author=self.author))
+            posts.append(
+                Post.objects.create(text=str(i), author=self.stranger))
+        posts.reverse()
+        self.assertFalse(TimelineEntry.objects.filter(
+            author=self.stranger).exists())
+        self.assertEqual(TimelineEntry.objects.filter(
+            author=self.author).count(), 5)
+        first = TimelinePaginator(self.user, 4).page(1)
+        second = TimelinePaginator(self.user, 4).page(
+            2, after=first.next_cursor)
+        back = TimelinePaginator(self.user, 4).page(
+            1, before=encode_cursor(posts[4]))
+        self.assertEqual(list(first), posts[:4])
+        self.assertEqual(list(second), posts[4:8])
+        self.assertEqual(list(back), posts[:4])
+        self.assertEqual(first.paginator.count, 10)
+        self.assertEqual(
+            list(TimelinePaginator(self.user, 4).page(3)), posts[8:])
+
+    @override_settings(FOLLOW_FANOUT_LIMIT=2)
+    def test_posts_delivered_when_author_drops_below_limit(self):
+        self.follow()
+        Follow.objects.create(user=self.stranger, author=self.author)
+        post = Post.objects.create(text='знаменитость', author=self.author)
+        self.assertFalse(TimelineEntry.objects.exists())
+        Follow.objects.get(user=self.stranger).delete()
+        self.assertEqual(self.feed(), [post])
+        self.assertEqual(TimelineEntry.objects.get(user=self.user).post, post)
+
+    @override_settings(
+        FOLLOW_FANOUT_LIMIT=3, FOLLOW_BACKFILL_POSTS=2, FOLLOW_REFILL_BATCH=1)
+    def test_refill_delivers_recent_posts_in_batches(self):
+        reader = User.objects.create_user(username='Olga')
+        for user in (self.user, self.stranger, reader):
+            Follow.objects.create(user=user, author=self.author)
+        posts = [
+            Post.objects.create(text=str(i), author=self.author)
+            for i in range(3)
+        ]
+        self.assertFalse(TimelineEntry.objects.exists())
+        Follow.objects.get(user=reader).delete()
+        for user in (self.user, self.stranger):
+            self.assertEqual(
+                set(TimelineEntry.objects.filter(user=user).values_list(
+                    'post', flat=True)),
+                {posts[2].pk, posts[1].pk})
+
+    def test_author_card_shows_counters(self):
+        self.follow()
+        response = self.client.get(
+            reverse('posts:profile', kwargs={'username': 'Leo'}))
+        self.assertContains(response, 'Подписчиков: 1')
+        self.assertContains(response, 'Отписаться')
@@ -0,0 +1,108 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.bulk import insert_posts, posts_written
+from posts.models import SNIPPET_LENGTH, Group, Post
+
+User = get_user_model()
+
+
+class GroupDirectoryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='Amalia')
+        self.group = Group.objects.create(title='Группа', slug='group')
+        self.other = Group.objects.create(title='Беседы', slug='other')
+        self.client = Client()
+
+    def last_post(self, group):
+        return Group.objects.get(pk=group.pk).last_post
+
+    def test_last_post_follows_post_writes(self):
+        first = Post.objects.create(
+            text='первая', author=self.author, group=self.group)
+        second = Post.objects.create(
+            text='вторая', author=self.author, group=self.group)
+        self.assertEqual(self.last_post(self.group), second)
+
+        second.group = self.other
+        second.save()
+        self.assertEqual(self.last_post(self.group), first)
+        self.assertEqual(self.last_post(self.other), second)
+
+        second.delete()
+        self.assertIsNone(self.last_post(self.other))
+        first.delete()
+        self.assertIsNone(self.last_post(self.group))
+
+    def test_bulk_writes_update_last_post(self):
+        posts_written([], [])
+        first = Post.objects.create(
+            text='первая', author=self.author, group=self.group)
+        insert_posts([
+            ('вставленная', first.pub_date, self.author.pk, self.group.pk)])
+        posts_written([self.author.pk], [self.group.pk])
+        group = Group.objects.get(pk=self.group.pk)
+        self.assertEqual(group.post_count, 2)
+        self.assertEqual(group.last_post.text, 'вставленная')
+
+    @override_settings(GROUPS_PER_PAGE=20)
+    def test_directory_page_renders_in_one_query(self):
+        Group.objects.bulk_create(
+            Group(title=f'Группа {number}', slug=f'group-{number}')
+            for number in range(50)
+        )
+        Post.objects.create(
+            text='длинная ' * 100, author=self.author, group=self.group)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('posts:groups'))
+        self.assertEqual(len(response.context['page']), 20)
+        group_queries = [
+            query['sql'] for query in queries
+            if 'posts_group' in query['sql']]
+        # The page itself and COUNT(*) for the paginator.
+        self.assertEqual(len(group_queries), 2)
+        self.assertIn('COUNT(*)', group_queries[0])
+        # Only the head of the latest post is read.
+        self.assertNotIn('"posts_post"."text"', group_queries[1])
+        self.assertContains(response, 'длинная ' * 10)
+        self.assertNotContains(
+            response, 'длинная ' * (SNIPPET_LENGTH // 8 + 2))
+        response = self.client.get(
+            reverse('posts:groups'), {'page': 3, 'sort': 'title'})
+        self.assertEqual(len(response.context['page']), 12)
+        self.assertContains(response, '?page=2&sort=title')
+
+    def test_sort_orders(self):
+        for text, group in (
+            ('старая', self.group),
+            ('вторая', self.group),
+            ('новая', self.other),
+        ):
+            Post.objects.create(text=text, author=self.author, group=group)
+        expected = {
+            'posts': [self.group, self.other],
+            'recent': [self.other, self.group],
+            'title': [self.other, self.group],
+            'unknown': [self.group, self.other],
+        }
+        for sort, groups in expected.items():
+            with self.subTest(sort=sort):
+                response = self.client.get(
+                    reverse('posts:groups'), {'sort': sort})
+                self.assertEqual(list(response.context['page']), groups)
+
+    def test_post_write_invalidates_cached_directory(self):
+        url = reverse('posts:groups')
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        Post.objects.create(
+            text='свежая запись', author=self.author, group=self.other)
+        self.assertContains(self.client.get(url), 'свежая запись')
+        Group.objects.create(title='Новое сообщество', slug='new')
+        self.assertContains(self.client.get(url), 'Новое сообщество')
@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+from posts.queue import HANDLERS
+from posts.thumbnails import THUMBNAIL_SIZES, stored_thumbnails
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+def media_files():
+    return {
+        os.path.join(root, name)
+        for root, _, names in os.walk(MEDIA_ROOT) for name in names
+    }
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, TASKS_ALWAYS_EAGER=True)
+class PostImageTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='Amalia')
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def upload(self):
+        self.client.post(reverse('posts:new_post'), {
+            'text': 'С картинкой',
+            'image': SimpleUploadedFile(
+                'small.gif', SMALL_GIF, content_type='image/gif'),
+        })
+        return Post.objects.get()
+
+    def test_upload_makes_every_thumbnail(self):
+        post = self.upload()
+        self.assertTrue(post.image.name.startswith('posts/'))
+        urls = stored_thumbnails(post)
+        for size in THUMBNAIL_SIZES:
+            with self.subTest(size=size):
+                self.assertIn(size, urls)
+        # Stored in the row, not in a cache other processes cannot see.
+        cache.clear()
+        response = self.client.get(reverse(
+            'posts:post', kwargs={'username': 'Amalia', 'post_id': post.pk}))
+        self.assertContains(response, urls['detail'])
+
+    @override_settings(TASKS_ALWAYS_EAGER=False)
+    def test_upload_and_render_leave_resizing_to_worker(self):
+        post = self.upload()
+        self.assertEqual(stored_thumbnails(post), {})
+        files = media_files()
+        response = self.client.get(reverse(
+            'posts:post', kwargs={'username': 'Amalia', 'post_id': post.pk}))
+        self.assertContains(response, post.image.url)
+        self.assertEqual(media_files(), files)
+
+    @override_settings(TASKS_ALWAYS_EAGER=False)
+    def test_ready_thumbnails_replace_cached_pages(self):
+        post = self.upload()
+        url = reverse('posts:profile', kwargs={'username': 'Amalia'})
+        etag = self.client.get(url)['ETag']
+        HANDLERS['make_thumbnails']([{'post_id': post.pk}])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(
+            response, stored_thumbnails(Post.objects.get())['feed'])
+
+    def test_render_never_makes_thumbnails(self):
+        post = self.upload()
+        Post.objects.update(thumbnails=None)
+        with mock.patch('posts.thumbnails.get_thumbnail') as make:
+            response = self.client.get(reverse(
+                'posts:profile', kwargs={'username': 'Amalia'}))
+        make.assert_not_called()
+        self.assertContains(response, post.image.url)
+
+    def test_replaced_image_waits_for_its_thumbnails(self):
+        post = self.upload()
+        with mock.patch('posts.thumbnails.enqueue') as enqueue:
+            post.text = 'Без новой картинки'
+            post.save()
+            enqueue.assert_not_called()
+            post.image = SimpleUploadedFile(
+                'other.gif', SMALL_GIF, content_type='image/gif')
+            post.save()
+        enqueue.assert_called_once_with('make_thumbnails', post_id=post.pk)
+        self.assertEqual(stored_thumbnails(post), {})
@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+from yatube.metrics import HISTOGRAMS
+
+User = get_user_model()
+
+
+@override_settings(METRICS_SAMPLE_RATE=1.0, METRICS_TOKEN='secret')
+class MetricsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Amalia')
+        Post.objects.create(text='Первый', author=cls.user)
+
+    def setUp(self):
+        for histogram in HISTOGRAMS:
+            histogram.clear()
+        self.guest_client = Client()
+
+    def test_views_are_recorded_per_name(self):
+        self.guest_client.get(reverse('posts:index'))
+        self.guest_client.get(
+            reverse('posts:profile', kwargs={'username': 'Amalia'}))
+        metrics = self.guest_client.get(
+            reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret'
+        ).content.decode()
+        for name in ('yatube_request_duration_seconds_count',
+                     'yatube_db_queries_count',
+                     'yatube_db_duration_seconds_count',
+                     'yatube_template_duration_seconds_count'):
+            for view in ('posts:index', 'posts:profile'):
+                with self.subTest(name=name, view=view):
+                    self.assertIn(f'{name}{{view="{view}"}} 1', metrics)
+        self.assertNotIn(
+            'yatube_template_duration_seconds_sum{view="posts:index"} 0.0\n',
+            metrics)
+
+    def test_metrics_need_token_or_staff(self):
+        url = reverse('metrics')
+        # Behind the proxy every client comes from the local address.
+        for authorization in ('', 'Bearer wrong', 'secret'):
+            with self.subTest(authorization=authorization):
+                response = self.guest_client.get(
+                    url, REMOTE_ADDR='127.0.0.1',
+                    HTTP_AUTHORIZATION=authorization)
+                self.assertEqual(response.status_code, 404)
+        self.guest_client.force_login(User.objects.create_user(
+            username='admin', is_staff=True))
+        self.assertEqual(self.guest_client.get(url).status_code, 200)
@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.template.loader import render_to_string
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+from posts.paginator import CursorPaginator, encode_cursor
+from posts.templatetags.pagination import page_window
+
+User = get_user_model()
+
+
+class CursorPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Amalia')
+        for i in range(25):
+            Post.objects.create(text=str(i), author=cls.user)
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.ordered = list(Post.objects.order_by('-pub_date', '-id'))
+
+    def test_after_cursor_returns_next_page(self):
+        first = CursorPaginator(Post.objects.all(), 10).page(1)
+        second = CursorPaginator(Post.objects.all(), 10).page(
+            2, after=first.next_cursor)
+        self.assertEqual(list(first), self.ordered[:10])
+        self.assertEqual(list(second), self.ordered[10:20])
+        self.assertTrue(second.has_next())
+
+    def test_before_cursor_returns_previous_page(self):
+        third = CursorPaginator(Post.objects.all(), 10).page(
+            3, after=encode_cursor(self.ordered[19]))
+        second = CursorPaginator(Post.objects.all(), 10).page(
+            2, before=third.previous_cursor)
+        self.assertEqual(list(third), self.ordered[20:])
+        self.assertFalse(third.has_next())
+        self.assertEqual(list(second), self.ordered[10:20])
+
+    def test_approximate_count_runs_no_count_query(self):
+        paginator = CursorPaginator(
+            Post.objects.all(), 10, approximate_count=True)
+        with self.assertNumQueries(1):
+            page = paginator.get_page(2)
+            self.assertEqual(paginator.num_pages, 3)
+            self.assertEqual(page.end_index(), 20)
+
+    @override_settings(POSTS_APPROXIMATE_COUNT=True)
+    def test_deep_page_without_cursor_falls_back_to_first_page(self):
+        for number in ('999999999999999999999999', '102'):
+            with self.subTest(number=number):
+                response = self.guest_client.get(
+                    reverse('posts:index'), {'page': number})
+                self.assertEqual(response.context['page'].number, 1)
+        # Cursors reach pages at any depth.
+        page = CursorPaginator(
+            Post.objects.all(), 10, approximate_count=True).page(
+                102, after=encode_cursor(self.ordered[9]))
+        self.assertEqual(list(page), self.ordered[10:20])
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        response = self.guest_client.get(
+            reverse('posts:index'), {'page': '2', 'after': 'garbage'})
+        self.assertEqual(response.context['page'].number, 1)
+
+    @override_settings(POSTS_APPROXIMATE_COUNT=True)
+    def test_next_link_carries_cursor(self):
+        response = self.guest_client.get(reverse('posts:index'))
+        page = response.context['page']
+        self.assertContains(
+            response, f'?page=2&after={page.next_cursor}')
+
+    def test_page_window_shows_nearby_first_and_last(self):
+        page = CursorPaginator(Post.objects.all(), 2).page(7)
+        numbers = [link and link.number for link in page_window(page)]
+        self.assertEqual(numbers, [1, None, 5, 6, 7, 8, 9, None, 13])
+
+    def test_page_window_leaves_out_deep_offsets(self):
+        paginator = CursorPaginator(Post.objects.all(), 2)
+        page = paginator.page(7, after=encode_cursor(self.ordered[11]))
+        links = page_window(page, max_offset=10)
+        self.assertEqual(
+            [link and link.number for link in links],
+            [1, None, 5, 6, 7, 8, None])
+        # The neighbours past the limit keep their cursors.
+        self.assertTrue(links[-2].cursor.startswith('&after='))
+
+    def test_approximate_paginator_renders_without_count(self):
+        paginator = CursorPaginator(
+            Post.objects.all(), 2, approximate_count=True)
+        with self.assertNumQueries(1):
+            html = render_to_string(
+                'include/paginator.html', {'page': paginator.get_page(7)})
+        self.assertIn('?page=1"', html)
+        self.assertIn('?page=8&after=', html)
+        self.assertNotIn('?page=9', html)
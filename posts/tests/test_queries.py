@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import FEED_TEXT_LENGTH, Group, Post
+
+User = get_user_model()
+
+
+class FeedQueryBudgetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Amalia')
+        cls.group = Group.objects.create(title='Группа', slug='group')
+        for i in range(10):
+            author = User.objects.create_user(username=f'author{i}')
+            group = Group.objects.create(title=f'Группа {i}', slug=f'g{i}')
+            Post.objects.create(text=str(i), author=author, group=group)
+            Post.objects.create(
+                text=str(i), author=cls.user, group=cls.group)
+        cls.post = Post.objects.create(
+            text='a' * (FEED_TEXT_LENGTH * 2), author=cls.user)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_feed_pages_run_fixed_number_of_queries(self):
+        budgets = {
+            reverse('posts:index'): 2,
+            reverse('posts:group', kwargs={'slug': 'group'}): 4,
+            reverse('posts:profile', kwargs={'username': 'Amalia'}): 4,
+            reverse(
+                'posts:post',
+                kwargs={'username': 'Amalia', 'post_id': self.post.pk}
+            ): 2,
+        }
+        for url, queries in budgets.items():
+            with self.subTest(url=url):
+                with self.assertNumQueries(queries):
+                    self.guest_client.get(url)
+
+    def test_logged_in_reader_costs_no_auth_queries(self):
+        client = Client()
+        client.force_login(self.user)
+        url = reverse('posts:profile', kwargs={'username': 'Amalia'})
+        # Loads the user into the per-process cache.
+        client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        self.assertEqual(response.context['user'], self.user)
+        for query in queries:
+            self.assertNotIn('django_session', query['sql'])
+            self.assertNotIn('WHERE "auth_user"."id"', query['sql'])
+
+    def test_feed_shows_shortened_text(self):
+        response = self.guest_client.get(reverse('posts:index'))
+        post = response.context['page'][0]
+        self.assertEqual(len(post.text_preview), FEED_TEXT_LENGTH)
+        self.assertTrue(post.text_preview.endswith('…'))
+
+    def test_feed_posts_print_without_queries(self):
+        posts = list(Post.objects.feed())
+        with self.assertNumQueries(0):
+            names = [str(post) for post in posts]
+        self.assertEqual(names[0], 'a' * 15)
+
+    def test_post_page_shows_full_text(self):
+        response = self.guest_client.get(
+            reverse(
+                'posts:post',
+                kwargs={'username': 'Amalia', 'post_id': self.post.pk}))
+        self.assertEqual(
+            response.context['post'].text_preview, self.post.text)
@@ -0,0 +1,87 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+
+
+@override_settings(RATELIMITS={
+    'new_post': '2/m', 'post_edit': '2/m', 'signup': '1/h'})
+class RateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='Amalia')
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_posting_limited_per_user(self):
+        url = reverse('posts:new_post')
+        # At the very start of a window, so none of it slides out.
+        with mock.patch('yatube.ratelimit.time.time', return_value=6000.0):
+            for _ in range(2):
+                self.client.post(url, {'text': 'запись'})
+            response = self.client.post(url, {'text': 'запись'})
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response['Retry-After'], '60')
+            self.assertEqual(Post.objects.count(), 2)
+            # Reading the form is not limited.
+            self.assertEqual(self.client.get(url).status_code, 200)
+            other = Client()
+            other.force_login(User.objects.create_user(username='Other'))
+            self.assertEqual(
+                other.post(url, {'text': 'запись'}).status_code, 302)
+
+    def test_previous_window_slides_out(self):
+        url = reverse('posts:new_post')
+        with mock.patch('yatube.ratelimit.time.time') as now:
+            now.return_value = 6000.0
+            for _ in range(2):
+                self.client.post(url, {'text': 'запись'})
+            # A quarter into the next window 3/4 of the old posts count.
+            now.return_value = 6075.0
+            response = self.client.post(url, {'text': 'запись'})
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response['Retry-After'], '15')
+            now.return_value = 6090.0
+            response = self.client.post(url, {'text': 'запись'})
+            self.assertEqual(response.status_code, 302)
+
+    def test_signup_limited_per_address(self):
+        data = {
+            'username': 'newbie',
+            'password1': 'Sup3r-secret-pass',
+            'password2': 'Sup3r-secret-pass',
+        }
+        guest = Client()
+        guest.post(reverse('signup'), data)
+        data['username'] = 'another'
+        # Turned away before the form is validated against the database.
+        with self.assertNumQueries(0):
+            response = guest.post(reverse('signup'), data)
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(User.objects.filter(username='another').exists())
+
+    def test_signup_limited_per_forwarded_client(self):
+        data = {
+            'password1': 'Sup3r-secret-pass',
+            'password2': 'Sup3r-secret-pass',
+        }
+        guest = Client()
+
+        def signup(username, forwarded_for, remote_addr='127.0.0.1'):
+            return guest.post(
+                reverse('signup'), {'username': username, **data},
+                REMOTE_ADDR=remote_addr, HTTP_X_FORWARDED_FOR=forwarded_for)
+
+        # Both come through the local proxy, as different clients.
+        self.assertEqual(signup('first', '203.0.113.1').status_code, 302)
+        self.assertEqual(signup('second', '203.0.113.2').status_code, 302)
+        # A hop the client wrote itself does not make it another client.
+        response = signup('third', '198.51.100.7, 203.0.113.1')
+        self.assertEqual(response.status_code, 429)
+        # Nor does the header from a client that is not a proxy.
+        signup('fourth', '203.0.113.3', remote_addr='203.0.113.9')
+        response = signup('fifth', '203.0.113.4', remote_addr='203.0.113.9')
+        self.assertEqual(response.status_code, 429)
@@ -0,0 +1,60 @@
+from unittest import mock
+
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from posts import views
+from posts.models import Post
+from yatube.routers import (PIN_COOKIE, PrimaryReplicaRouter,
+                            ReplicaPinMiddleware, use_primary)
+
+
+@override_settings(DATABASE_REPLICAS=['reader'])
+class ReplicaRouterTests(SimpleTestCase):
+    databases = {'default'}
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+
+    def read_db(self, request):
+        """Database a read made while handling ``request`` goes to."""
+        used = []
+
+        def view(request):
+            used.append(self.router.db_for_read(Post))
+            return HttpResponse()
+
+        response = ReplicaPinMiddleware(view)(request)
+        return used[0], response
+
+    def test_reads_go_to_replica_and_writes_to_primary(self):
+        self.assertEqual(self.router.db_for_read(Post), 'reader')
+        self.assertEqual(self.router.db_for_write(Post), 'default')
+        with use_primary():
+            self.assertEqual(self.router.db_for_read(Post), 'default')
+        with transaction.atomic():
+            self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    def test_client_reads_primary_after_writing(self):
+        self.assertEqual(self.read_db(self.factory.get('/'))[0], 'reader')
+        db, response = self.read_db(self.factory.post('/new/'))
+        self.assertEqual(db, 'default')
+        self.assertIn(PIN_COOKIE, response.cookies)
+        request = self.factory.get('/Amalia/')
+        request.COOKIES[PIN_COOKIE] = '1'
+        self.assertEqual(self.read_db(request)[0], 'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_uses_primary(self):
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    @mock.patch('posts.views.render')
+    def test_cached_feed_pages_render_from_primary(self, render):
+        render.side_effect = lambda *args: self.router.db_for_read(Post)
+        request = self.factory.get('/')
+        # Past conditional_feed, whose validators may read a replica.
+        for view in (views.index.__wrapped__, views.group_index):
+            with self.subTest(view=view.__name__):
+                self.assertEqual(view(request), 'default')
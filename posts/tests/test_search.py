@@ -0,0 +1,65 @@
+from io import StringIO
+
+from django.contrib.admin.sites import site
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, RequestFactory, TestCase
+from django.urls import reverse
+
+from posts.models import Post
+
+User = get_user_model()
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Amalia')
+        cls.best = Post.objects.create(
+            text='капучино капучино и круассан', author=cls.user)
+        cls.other = Post.objects.create(
+            text='чай и круассан, а потом капучино', author=cls.user)
+        cls.missing = Post.objects.create(text='просто чай', author=cls.user)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def search(self, query):
+        response = self.guest_client.get(reverse('posts:search'), {'q': query})
+        return list(response.context['page'])
+
+    def test_results_are_ranked(self):
+        self.assertEqual(self.search('капучино'), [self.best, self.other])
+
+    def test_edit_and_delete_update_index(self):
+        post = Post.objects.get(pk=self.missing.pk)
+        post.text = 'теперь капучино'
+        post.save()
+        self.assertIn(post, self.search('капучино'))
+        Post.objects.filter(pk=self.best.pk).delete()
+        self.assertNotIn(self.best, self.search('капучино'))
+
+    def test_query_syntax_is_escaped(self):
+        self.assertEqual(self.search('"круассан AND ('), [])
+        self.assertEqual(self.search(''), [])
+
+    def test_control_characters_are_dropped(self):
+        self.assertEqual(self.search('a\x00b'), [])
+        self.assertEqual(
+            self.search('капучино\x00\x1b'), [self.best, self.other])
+
+    def test_admin_search_uses_index(self):
+        request = RequestFactory().get('/admin/posts/post/')
+        queryset, _ = site._registry[Post].get_search_results(
+            request, Post.objects.all(), 'круассан')
+        self.assertEqual(set(queryset), {self.best, self.other})
+
+    def test_rebuild_command_restores_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO posts_post_fts(posts_post_fts) "
+                           "VALUES ('delete-all')")
+        self.assertEqual(self.search('чай'), [])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(len(self.search('чай')), 2)
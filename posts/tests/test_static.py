@@ -0,0 +1,71 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from yatube import storage
+
+CSS = b'body { color: #333; }\n' * 100
+
+
+class CompressedManifestStorageTests(TestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source)
+        self.addCleanup(shutil.rmtree, self.root)
+        os.makedirs(os.path.join(self.source, 'css'))
+        with open(os.path.join(self.source, 'css', 'site.css'), 'wb') as f:
+            f.write(CSS)
+        settings = override_settings(
+            STATICFILES_STORAGE=(
+                'yatube.storage.CompressedManifestStaticFilesStorage'),
+            STATIC_ROOT=self.root,
+            STATICFILES_DIRS=[self.source],
+            STATICFILES_FINDERS=[
+                'django.contrib.staticfiles.finders.FileSystemFinder'],
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def render(self, name='css/site.css'):
+        return Template(
+            "{% load static %}{% static name %}").render(
+                Context({'name': name}))
+
+    def test_collectstatic_writes_hashed_compressed_files(self):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        url = self.render()
+        self.assertRegex(url, r'^/static/css/site\.[0-9a-f]{12}\.css$')
+        path = os.path.join(self.root, url[len('/static/'):])
+        with gzip.open(path + '.gz') as compressed:
+            self.assertEqual(compressed.read(), CSS)
+        self.assertEqual(
+            os.path.exists(path + '.br'), storage.brotli is not None)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.root, 'staticfiles.json')))
+
+    def test_names_missing_from_manifest_are_hashed(self):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        with open(os.path.join(self.root, 'css', 'late.css'), 'wb') as f:
+            f.write(CSS)
+        self.assertRegex(
+            self.render('css/late.css'),
+            r'^/static/css/late\.[0-9a-f]{12}\.css$')
+
+    def test_pages_render_assets_missing_from_the_tree(self):
+        # base.html links bootstrap/dist, which is not vendored.
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cache.clear()
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(
+            response, '/static/bootstrap/dist/css/bootstrap.min.css')
+        self.assertEqual(
+            self.render('bootstrap/dist/css/bootstrap.min.css'),
+            '/static/bootstrap/dist/css/bootstrap.min.css')
@@ -0,0 +1,112 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from posts.models import Follow, Post, Task, TimelineEntry
+from posts.queue import HANDLERS, enqueue
+
+User = get_user_model()
+
+
+def failing(payloads):
+    raise RuntimeError('сбой')
+
+
+def failing_on_bad(payloads):
+    if any(payload.get('bad') for payload in payloads):
+        raise RuntimeError('сбой')
+    failing_on_bad.done.extend(payload['number'] for payload in payloads)
+
+
+# The worker runs batches in other threads, which only see committed rows.
+@override_settings(TASKS_ALWAYS_EAGER=False)
+class TaskQueueTests(TransactionTestCase):
+    def run_worker(self):
+        out = StringIO()
+        # One batch at a time: the in-memory test database fails writes to a
+        # table another connection is writing ("table is locked") instead
+        # of waiting for busy_timeout as the WAL database file does.
+        call_command('run_worker', '--once', '--threads=1', stdout=out)
+        return out.getvalue()
+
+    def test_post_side_effects_wait_for_worker(self):
+        author = User.objects.create_user(username='Leo')
+        reader = User.objects.create_user(
+            username='Amalia', email='amalia@example.com')
+        Follow.objects.create(user=reader, author=author)
+        Post.objects.create(text='первая', author=author)
+        Post.objects.create(text='вторая', author=author)
+        self.assertEqual(Task.objects.count(), 4)
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(mail.outbox, [])
+
+        self.assertIn('Выполнено задач: 4', self.run_worker())
+        self.assertFalse(Task.objects.exists())
+        self.assertEqual(TimelineEntry.objects.filter(user=reader).count(), 2)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[0].to, ['amalia@example.com'])
+
+    @override_settings(SITE_URL='https://yatube.example')
+    def test_tasks_run_twice_deliver_once(self):
+        author = User.objects.create_user(username='Leo')
+        reader = User.objects.create_user(
+            username='Amalia', email='amalia@example.com')
+        Follow.objects.create(user=reader, author=author)
+        post = Post.objects.create(text='первая', author=author)
+        # As if the lease of the first worker ran out mid-batch.
+        self.run_worker()
+        for name in ('fan_out', 'notify_followers'):
+            HANDLERS[name]([{'post_id': post.pk}])
+        self.assertEqual(TimelineEntry.objects.filter(user=reader).count(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn(
+            f'https://yatube.example/Leo/{post.pk}/', mail.outbox[0].body)
+
+    def test_rolled_back_write_queues_nothing(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                enqueue('fan_out', post_id=1)
+                raise RuntimeError
+        self.assertFalse(Task.objects.exists())
+
+    @override_settings(TASKS_MAX_ATTEMPTS=2, TASKS_RETRY_DELAY=10)
+    def test_failed_batch_retried_then_given_up(self):
+        with mock.patch.dict(HANDLERS, {'failing': failing}):
+            enqueue('failing', number=1)
+            enqueue('failing', number=2)
+            with self.assertLogs('posts.queue', 'ERROR'):
+                self.assertIn('с ошибкой: 2', self.run_worker())
+            task = Task.objects.first()
+            self.assertEqual(task.attempts, 1)
+            self.assertFalse(task.failed)
+            self.assertIn('сбой', task.last_error)
+            self.assertGreater(task.run_at, timezone.now())
+
+            Task.objects.update(run_at=timezone.now())
+            with self.assertLogs('posts.queue', 'ERROR'):
+                self.run_worker()
+            self.assertEqual(Task.objects.filter(failed=True).count(), 2)
+            # Given up tasks stay for inspection but are not run again.
+            self.assertIn('Выполнено задач: 0, с ошибкой: 0',
+                          self.run_worker())
+
+    def test_bad_task_does_not_fail_its_batch(self):
+        failing_on_bad.done = []
+        with mock.patch.dict(HANDLERS, {'mixed': failing_on_bad}):
+            enqueue('mixed', number=1)
+            enqueue('mixed', bad=True)
+            enqueue('mixed', number=2)
+            with self.assertLogs('posts.queue', 'WARNING'):
+                self.assertIn('Выполнено задач: 2, с ошибкой: 1',
+                              self.run_worker())
+        task = Task.objects.get(name='mixed')
+        self.assertIn('bad', task.payload)
+        self.assertEqual(task.attempts, 1)
+        # The good tasks ran alone, after the batch was rolled back.
+        self.assertEqual(failing_on_bad.done, [1, 2])
@@ -1,7 +1,11 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import Client, TestCase
+from django.urls import reverse
 
+from posts import urls
 from posts.models import Group, Post
+from users.forms import RESERVED_USERNAMES
 
 User = get_user_model()
 
@@ -77,3 +81,24 @@ class PostURLTests(TestCase):
             with self.subTest():
                 response = self.authorized_client.get(reverse_name)
                 self.assertTemplateUsed(response, template)
+
+
+class ReservedUsernameTests(TestCase):
+    def test_site_paths_are_reserved(self):
+        for pattern in urls.urlpatterns:
+            segment = str(pattern.pattern).split('/')[0]
+            if segment and '<' not in segment:
+                with self.subTest(segment=segment):
+                    self.assertIn(segment, RESERVED_USERNAMES)
+
+    def test_signup_rejects_reserved_username(self):
+        cache.clear()
+        response = Client().post(reverse('signup'), {
+            'username': 'Groups',
+            'password1': 'Sup3r-secret-pass',
+            'password2': 'Sup3r-secret-pass',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertFormError(
+            response, 'form', 'username', 'Это имя занято, выберите другое')
+        self.assertFalse(User.objects.exists())
@@ -0,0 +1,55 @@
+"""Post image thumbnails, made by the task queue after an upload.
+
+Pages never resize images themselves: ``thumbnail_url`` reads the URLs the
+worker stored in the post row, which every process sees, and falls back to
+the original image until they are there.
+"""
+import json
+
+from sorl.thumbnail import get_thumbnail
+
+from .cache import invalidate_feeds, post_feeds
+from .counters import change_post_counts
+from .models import Post
+from .queue import enqueue
+
+# Geometry and sorl options of every size shown on the site.
+THUMBNAIL_SIZES = {
+    'feed': ('960x339', {'crop': 'center', 'upscale': True}),
+    'detail': ('1200', {'upscale': False}),
+}
+
+
+def stored_thumbnails(post):
+    """URLs by size made from the current image of ``post``, or ``{}``."""
+    if not post.thumbnails:
+        return {}
+    urls = json.loads(post.thumbnails)
+    # Left over from a replaced image until the new ones are made.
+    if urls.get('source') != post.image.name:
+        return {}
+    return urls
+
+
+def make_thumbnails(post):
+    """Create every size of the image of ``post`` and store the URLs."""
+    name = post.image.name
+    urls = {'source': name}
+    for size, (geometry, options) in THUMBNAIL_SIZES.items():
+        urls[size] = get_thumbnail(name, geometry, **options).url
+    # Not over the URLs of an image uploaded in the meantime.
+    if Post.objects.filter(pk=post.pk, image=name).update(
+            thumbnails=json.dumps(urls)):
+        # Pages cached or validated since the upload show the original.
+        change_post_counts(post.author_id, post.group_id, delta=0)
+        invalidate_feeds(post_feeds(post))
+
+
+def schedule_thumbnails(post):
+    if post.image and not stored_thumbnails(post):
+        enqueue('make_thumbnails', post_id=post.pk)
+
+
+def thumbnail_url(image, size):
+    """URL of a ready thumbnail, or of the original image."""
+    return stored_thumbnails(image.instance).get(size) or image.url
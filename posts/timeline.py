@@ -0,0 +1,160 @@
+"""The /follow/ feed, materialised per follower when a post is written.
+
+Every new post is copied into ``TimelineEntry`` for each follower of its
+author, so reading the feed is an index range scan. Authors with at least
+``FOLLOW_FANOUT_LIMIT`` followers are skipped on write; their posts are
+merged into the feed when it is read, until they drop below the limit
+again: then their recent posts are delivered to every follower by
+``refill``. A post is in a feed at most once, so repeated deliveries are
+ignored.
+"""
+from django.conf import settings
+from django.db import connection
+from django.utils.functional import cached_property
+
+from .models import Follow, Post, Profile, TimelineEntry
+from .paginator import CursorPaginator, keyset_slice
+
+FAN_OUT_SQL = (
+    'INSERT OR IGNORE INTO posts_timelineentry '
+    '(user_id, post_id, author_id, pub_date) '
+    'SELECT follow.user_id, %s, %s, %s FROM posts_follow follow '
+    'JOIN posts_profile profile ON profile.user_id = follow.author_id '
+    'WHERE follow.author_id = %s AND profile.follower_count < %s'
+)
+BACKFILL_SQL = (
+    'INSERT OR IGNORE INTO posts_timelineentry '
+    '(user_id, post_id, author_id, pub_date) '
+    'SELECT %s, id, author_id, pub_date FROM posts_post '
+    'WHERE author_id = %s ORDER BY pub_date DESC, id DESC LIMIT %s'
+)
+REFILL_SQL = (
+    'INSERT OR IGNORE INTO posts_timelineentry '
+    '(user_id, post_id, author_id, pub_date) '
+    'SELECT follow.user_id, post.id, post.author_id, post.pub_date '
+    'FROM posts_follow follow JOIN ('
+    'SELECT id, author_id, pub_date FROM posts_post WHERE author_id = %s '
+    'ORDER BY pub_date DESC, id DESC LIMIT %s) post '
+    'WHERE follow.author_id = %s AND follow.id BETWEEN %s AND %s'
+)
+REBUILD_SQL = (
+    'INSERT OR IGNORE INTO posts_timelineentry '
+    '(user_id, post_id, author_id, pub_date) '
+    'SELECT follow.user_id, post.id, post.author_id, post.pub_date '
+    'FROM posts_follow follow '
+    'JOIN posts_profile profile ON profile.user_id = follow.author_id '
+    'JOIN posts_post post ON post.author_id = follow.author_id '
+    'WHERE profile.follower_count < %s'
+)
+
+
+def fan_out(post):
+    """Deliver a new post to the followers of its author."""
+    with connection.cursor() as cursor:
+        cursor.execute(FAN_OUT_SQL, [
+            post.pk,
+            post.author_id,
+            connection.ops.adapt_datetimefield_value(post.pub_date),
+            post.author_id,
+            settings.FOLLOW_FANOUT_LIMIT,
+        ])
+
+
+def backfill(user_id, author_id):
+    """Copy recent posts of a newly followed author into the feed."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            BACKFILL_SQL,
+            [user_id, author_id, settings.FOLLOW_BACKFILL_POSTS]
+        )
+
+
+def refill(author_id, after=0):
+    """Deliver recent posts of an author who dropped below the fan-out limit.
+
+    Those written while the author was above it were only merged on read;
+    like a new follower, each feed gets ``FOLLOW_BACKFILL_POSTS`` of them.
+    Fills the feeds of ``FOLLOW_REFILL_BATCH`` followers past the follow id
+    ``after`` and returns the id to continue from, or ``None`` when done.
+    """
+    if Profile.objects.filter(
+            user_id=author_id,
+            follower_count__gte=settings.FOLLOW_FANOUT_LIMIT).exists():
+        return None
+    batch = settings.FOLLOW_REFILL_BATCH
+    follows = list(Follow.objects.filter(
+        author_id=author_id, pk__gt=after,
+    ).order_by('pk').values_list('pk', flat=True)[:batch])
+    if not follows:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(REFILL_SQL, [
+            author_id, settings.FOLLOW_BACKFILL_POSTS,
+            author_id, follows[0], follows[-1],
+        ])
+    return follows[-1] if len(follows) == batch else None
+
+
+def remove(user_id, author_id):
+    TimelineEntry.objects.filter(user_id=user_id, author_id=author_id).delete()
+
+
+def rebuild_timelines():
+    """Refill every feed; for posts written around the signals."""
+    TimelineEntry.objects.all().delete()
+    with connection.cursor() as cursor:
+        cursor.execute(REBUILD_SQL, [settings.FOLLOW_FANOUT_LIMIT])
+
+
+class TimelinePaginator(CursorPaginator):
+    """Pages of a user's feed: timeline entries plus followed celebrities.
+
+    Rows are ``(pub_date, post_id)`` pairs; the posts of the page are
+    fetched with one more query.
+    """
+    cursor_fields = ('pub_date', 'post_id')
+
+    def __init__(self, user, per_page, **kwargs):
+        self.celebrities = list(Follow.objects.filter(
+            user=user,
+            author__profile__follower_count__gte=(
+                settings.FOLLOW_FANOUT_LIMIT),
+        ).values_list('author_id', flat=True))
+        entries = TimelineEntry.objects.filter(user=user)
+        if self.celebrities:
+            # Delivered before the author crossed the limit.
+            entries = entries.exclude(author_id__in=self.celebrities)
+        super().__init__(
+            entries.values_list(*self.cursor_fields), per_page, **kwargs)
+
+    @cached_property
+    def celebrity_posts(self):
+        return Post.objects.filter(author_id__in=self.celebrities).order_by(
+            '-pub_date', '-id').values_list('pub_date', 'id')
+
+    @cached_property
+    def count(self):
+        count = super().count
+        if self.celebrities and not self.approximate_count:
+            count += self.celebrity_posts.count()
+        return count
+
+    def fetch_rows(self, number, after=None, before=None):
+        if not self.celebrities:
+            return super().fetch_rows(number, after=after, before=before)
+        if after or before:
+            rows = super().fetch_rows(number, after=after, before=before)
+            rows += keyset_slice(
+                self.celebrity_posts, ('pub_date', 'id'), self.per_page,
+                number, after=after, before=before
+            )
+            limit = self.per_page if before else self.per_page + 1
+            return sorted(rows, reverse=not before)[:limit]
+        # Numbered pages merge everything up to the page from both sources.
+        end = number * self.per_page + 1
+        rows = list(self.object_list[:end]) + list(self.celebrity_posts[:end])
+        return sorted(rows, reverse=True)[end - self.per_page - 1:end]
+
+    def page_objects(self, rows):
+        posts = Post.objects.feed().in_bulk([pk for _, pk in rows])
+        return [posts[pk] for _, pk in rows if pk in posts]
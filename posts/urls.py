@@ -6,9 +6,55 @@ app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('rss/', views.index_rss, name='index_rss'),
+    path(
+        'archive/<int:year>/',
+        views.index_archive,
+        name='index_archive'
+    ),
+    path(
+        'archive/<int:year>/<int:month>/',
+        views.index_archive,
+        name='index_archive'
+    ),
+    path('groups/', views.group_index, name='groups'),
     path('group/<str:slug>/', views.group_posts, name='group'),
+    path('group/<str:slug>/rss/', views.group_rss, name='group_rss'),
+    path(
+        'group/<str:slug>/archive/<int:year>/',
+        views.group_archive,
+        name='group_archive'
+    ),
+    path(
+        'group/<str:slug>/archive/<int:year>/<int:month>/',
+        views.group_archive,
+        name='group_archive'
+    ),
     path('new/', views.NewPostView.as_view(), name='new_post'),
+    path('search/', views.search, name='search'),
+    path('follow/', views.follow_index, name='follow_index'),
     path('<str:username>/', views.profile, name='profile'),
+    path('<str:username>/rss/', views.profile_rss, name='profile_rss'),
+    path(
+        '<str:username>/archive/<int:year>/',
+        views.profile_archive,
+        name='profile_archive'
+    ),
+    path(
+        '<str:username>/archive/<int:year>/<int:month>/',
+        views.profile_archive,
+        name='profile_archive'
+    ),
+    path(
+        '<str:username>/follow/',
+        views.profile_follow,
+        name='profile_follow'
+    ),
+    path(
+        '<str:username>/unfollow/',
+        views.profile_unfollow,
+        name='profile_unfollow'
+    ),
     path('<str:username>/<int:post_id>/', views.post_view, name='post'),
     path(
         '<str:username>/<int:post_id>/edit/',
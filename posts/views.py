@@ -1,36 +1,229 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.paginator import Paginator
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
+from django.utils.decorators import method_decorator
+from django.utils.functional import SimpleLazyObject
 from django.views.generic import CreateView
 from django.contrib.auth.decorators import login_required
 
+from yatube.ratelimit import ratelimit
+from yatube.routers import use_primary
+
+from .archive import (INDEX_SCOPE, author_scope, group_scope, month_counts,
+                      period_range)
+from .cache import (GROUPS_FEED, INDEX_FEED, author_feed, feed_cache_context,
+                    group_feed)
+from .conditional import (conditional_feed, group_state, index_state,
+                          post_state, profile_state)
+from .counters import get_post_count
+from .feeds import rss_response
 from .forms import PostForm
-from .models import Group, Post
+from .models import Follow, Group, Post
+from .paginator import CursorPaginator, page_key
+from .search import search_posts
+from .timeline import TimelinePaginator
 
 User = get_user_model()
 
 
+def get_page(request, object_list, paginator_class=CursorPaginator):
+    """Page of the feed, fetched only if the cached fragment is missing."""
+    paginator = paginator_class(
+        object_list,
+        settings.POSTS_PER_PAGE,
+        approximate_count=settings.POSTS_APPROXIMATE_COUNT
+    )
+    return SimpleLazyObject(
+        lambda: paginator.get_page(
+            request.GET.get('page'),
+            after=request.GET.get('after'),
+            before=request.GET.get('before')
+        )
+    )
+
+
+def feed_page_key(request):
+    return page_key(
+        request.GET.get('page'),
+        settings.POSTS_PER_PAGE,
+        after=request.GET.get('after'),
+        before=request.GET.get('before')
+    )
+
+
+@conditional_feed(index_state)
+@use_primary()
 def index(request):
-    paginator = Paginator(Post.objects.all(), 10)
-    page_number = request.GET.get('page')
-    page = paginator.get_page(page_number)
+    page = get_page(request, Post.objects.feed())
     return render(
         request,
         'index.html',
-        {'page': page, }
+        {
+            'page': page,
+            'page_key': feed_page_key(request),
+            **feed_cache_context(INDEX_FEED)
+        }
     )
 
 
+# Most posts ever, latest post, title.
+GROUP_ORDERINGS = {
+    'posts': ('-post_count', 'title'),
+    'recent': ('-last_post__pub_date', 'title'),
+    'title': ('title', 'pk'),
+}
+
+
+@use_primary()
+def group_index(request):
+    sort = request.GET.get('sort')
+    if sort not in GROUP_ORDERINGS:
+        sort = 'posts'
+    paginator = Paginator(
+        Group.objects.directory().order_by(*GROUP_ORDERINGS[sort]),
+        settings.GROUPS_PER_PAGE)
+    # Fetched only if the cached fragment is missing.
+    page = SimpleLazyObject(
+        lambda: paginator.get_page(request.GET.get('page')))
+    return render(request, 'groups.html', {
+        'page': page,
+        'page_key': page_key(
+            request.GET.get('page'), settings.GROUPS_PER_PAGE),
+        'sort': sort,
+        **feed_cache_context(GROUPS_FEED)
+    })
+
+
+@conditional_feed(group_state)
+@use_primary()
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    paginator = Paginator(group.posts.all(), 10)
-    page_number = request.GET.get('page')
-    page = paginator.get_page(page_number)
-    return render(request, 'group.html', {'group': group, 'page': page})
+    page = get_page(request, Post.objects.feed().filter(group=group))
+    context = {
+        'group': group,
+        'page': page,
+        'page_key': feed_page_key(request),
+        **feed_cache_context(group_feed(group.pk))
+    }
+    return render(request, 'group.html', context)
+
+
+@conditional_feed(index_state)
+def index_rss(request):
+    return rss_response(
+        request, 'Yatube', reverse('posts:index'), 'Последние записи',
+        Post.objects.all()
+    )
+
+
+@conditional_feed(group_state)
+def group_rss(request, slug):
+    group = get_object_or_404(Group, slug=slug)
+    return rss_response(
+        request, group.title, reverse('posts:group', kwargs={'slug': slug}),
+        group.description, Post.objects.filter(group=group)
+    )
+
+
+@conditional_feed(profile_state)
+def profile_rss(request, username):
+    author = get_object_or_404(User, username=username)
+    return rss_response(
+        request,
+        author.get_full_name() or author.username,
+        reverse('posts:profile', kwargs={'username': username}),
+        f'Записи {author.username}',
+        Post.objects.filter(author=author)
+    )
+
+
+def archive_page(request, posts, scope, url_name, url_args, year, month,
+                 context):
+    """Posts of a year or a month, with the months of ``scope`` aside."""
+    try:
+        start, end = period_range(year, month)
+    except ValueError:
+        raise Http404('Нет такого месяца')
+    page = get_page(
+        request, posts.filter(pub_date__gte=start, pub_date__lt=end))
+    months = [
+        (item, reverse(
+            url_name, args=(*url_args, item.month.year, item.month.month)))
+        for item in month_counts(scope)
+    ]
+    return render(request, 'archive.html', {
+        'page': page,
+        'months': months,
+        'period': start,
+        'is_month': month is not None,
+        **context,
+    })
+
+
+def index_archive(request, year, month=None):
+    return archive_page(
+        request, Post.objects.feed(), INDEX_SCOPE, 'posts:index_archive',
+        (), year, month, {})
+
+
+def group_archive(request, slug, year, month=None):
+    group = get_object_or_404(Group, slug=slug)
+    return archive_page(
+        request, Post.objects.feed().filter(group=group),
+        group_scope(group.pk), 'posts:group_archive', (slug,), year, month,
+        {'group': group})
+
+
+def profile_archive(request, username, year, month=None):
+    author = get_object_or_404(User, username=username)
+    return archive_page(
+        request, Post.objects.feed().filter(author=author),
+        author_scope(author.pk), 'posts:profile_archive', (username,), year,
+        month, {'author': author})
+
+
+@login_required
+def follow_index(request):
+    page = get_page(request, request.user, paginator_class=TimelinePaginator)
+    return render(request, 'follow.html', {'page': page})
+
+
+@login_required
+def profile_follow(request, username):
+    author = get_object_or_404(User, username=username)
+    if author != request.user:
+        Follow.objects.get_or_create(user=request.user, author=author)
+    return redirect('posts:profile', username=username)
 
 
+@login_required
+def profile_unfollow(request, username):
+    author = get_object_or_404(User, username=username)
+    for follow in Follow.objects.filter(user=request.user, author=author):
+        follow.delete()
+    return redirect('posts:profile', username=username)
+
+
+def is_following(user, author):
+    return (
+        user.is_authenticated
+        and user != author
+        and Follow.objects.filter(user=user, author=author).exists()
+    )
+
+
+def search(request):
+    query = request.GET.get('q', '').strip()
+    paginator = Paginator(search_posts(query), settings.POSTS_PER_PAGE)
+    page = paginator.get_page(request.GET.get('page'))
+    return render(request, 'search.html', {'page': page, 'query': query})
+
+
+@method_decorator(ratelimit('new_post'), name='post')
 class NewPostView(LoginRequiredMixin, CreateView):
     form_class = PostForm
     success_url = reverse_lazy('posts:index')
@@ -43,33 +236,45 @@ class NewPostView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
+@conditional_feed(profile_state)
+@use_primary()
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    paginator = Paginator(author.posts.all(), 10)
-    page_number = request.GET.get('page')
-    page = paginator.get_page(page_number)
-    num_posts = author.posts.count()
+    author = get_object_or_404(
+        User.objects.select_related('profile'), username=username)
+    page = get_page(request, Post.objects.feed().filter(author=author))
+    num_posts = get_post_count(author)
     context = {
         'num_posts': num_posts,
         'page': page,
-        'author': author
+        'page_key': feed_page_key(request),
+        'author': author,
+        'is_owner': request.user.username == author.username,
+        'following': is_following(request.user, author),
+        **feed_cache_context(author_feed(author.pk))
     }
     return render(request, 'profile.html', context)
 
 
+@conditional_feed(post_state)
 def post_view(request, username, post_id):
-    author = get_object_or_404(User, username=username)
-    post = get_object_or_404(Post, pk=post_id, author__username=username)
-    num_posts = author.posts.count()
+    post = get_object_or_404(
+        Post.objects.select_related('author__profile', 'group'),
+        pk=post_id,
+        author__username=username
+    )
+    author = post.author
+    num_posts = get_post_count(author)
     context = {
         'author': author,
         'post': post,
-        'num_posts': num_posts
+        'num_posts': num_posts,
+        'following': is_following(request.user, author),
     }
     return render(request, 'post.html', context)
 
 
 @login_required
+@ratelimit('post_edit')
 def post_edit(request, username, post_id):
     post = get_object_or_404(
         Post,
@@ -82,7 +287,8 @@ def post_edit(request, username, post_id):
                 kwargs={'username': username}
             )
         )
-    form = PostForm(request.POST or None, instance=post)
+    form = PostForm(
+        request.POST or None, files=request.FILES or None, instance=post)
     if form.is_valid():
         form.save()
         return redirect(
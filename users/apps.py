@@ -3,3 +3,13 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     name = 'users'
+
+    def ready(self):
+        from django.contrib.auth import get_user_model
+        from django.db.models.signals import post_delete, post_save
+
+        from .backends import user_changed
+
+        User = get_user_model()
+        post_save.connect(user_changed, sender=User)
+        post_delete.connect(user_changed, sender=User)
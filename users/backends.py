@@ -0,0 +1,52 @@
+"""Authentication backend that keeps recently seen users in process memory.
+
+``AuthenticationMiddleware`` loads ``request.user`` on every request; with
+signed cookie sessions this backend makes it the only query of the auth
+path, and only once per ``USER_CACHE_TIMEOUT``. Saving or deleting a user
+drops it from the cache of the current process; other processes keep the
+old copy, password hash included, until it expires.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+
+_users = OrderedDict()
+_lock = threading.Lock()
+
+
+def user_changed(sender, instance, **kwargs):
+    with _lock:
+        _users.pop(instance.pk, None)
+
+
+def clear_user_cache():
+    with _lock:
+        _users.clear()
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        with _lock:
+            entry = _users.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            model, db, names, values = entry[1:]
+            # A fresh instance per request, as the middleware may mutate it.
+            return model.from_db(db, names, values)
+        user = super().get_user(user_id)
+        if user is None:
+            return None
+        names = [field.attname for field in user._meta.concrete_fields]
+        entry = (
+            time.monotonic() + settings.USER_CACHE_TIMEOUT,
+            type(user), user._state.db, names,
+            [getattr(user, name) for name in names],
+        )
+        with _lock:
+            _users[user_id] = entry
+            _users.move_to_end(user_id)
+            while len(_users) > settings.USER_CACHE_SIZE:
+                _users.popitem(last=False)
+        return user
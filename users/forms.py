@@ -1,8 +1,16 @@
+from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
 
 User = get_user_model()
 
+# First path segments of the site's own pages: a profile at /<username>/
+# with one of these names would be hidden by them (see posts.urls).
+RESERVED_USERNAMES = frozenset({
+    'about', 'admin', 'archive', 'auth', 'follow', 'group', 'groups',
+    'media', 'metrics', 'new', 'rss', 'search', 'static',
+})
+
 
 class CreationForm(UserCreationForm):
     class Meta(UserCreationForm.Meta):
@@ -13,3 +21,9 @@ class CreationForm(UserCreationForm):
             'username',
             'email'
         )
+
+    def clean_username(self):
+        username = self.cleaned_data['username']
+        if username.lower() in RESERVED_USERNAMES:
+            raise forms.ValidationError('Это имя занято, выберите другое')
+        return username
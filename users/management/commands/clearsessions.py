@@ -0,0 +1,44 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет истёкшие сессии из базы небольшими порциями, '
+        'каждую в своей транзакции'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='Сколько сессий удалять за один запрос'
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0.1,
+            help='Пауза между порциями в секундах'
+        )
+
+    def handle(self, *args, **options):
+        engine = import_module(settings.SESSION_ENGINE)
+        try:
+            model = engine.SessionStore.get_model_class()
+        except AttributeError:
+            # Left over from the database backend.
+            model = Session
+        expired = model.objects.filter(expire_date__lt=timezone.now())
+        deleted = 0
+        while True:
+            keys = list(expired.values_list('pk', flat=True)[
+                :options['chunk_size']])
+            if not keys:
+                break
+            model.objects.filter(pk__in=keys).delete()
+            deleted += len(keys)
+            time.sleep(options['pause'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Удалено истёкших сессий: {deleted}'))
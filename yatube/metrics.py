@@ -0,0 +1,179 @@
+"""Per-view request timings exposed in the Prometheus text format.
+
+``MetricsMiddleware`` samples ``METRICS_SAMPLE_RATE`` of the requests and
+records wall time, number and duration of database queries and template
+render time under the resolved view name. With the rate at 0 the
+middleware removes itself from the chain. Streaming responses are measured
+up to the moment the view returns.
+
+``/metrics`` is served to staff users and to scrapers sending
+``Authorization: Bearer <METRICS_TOKEN>``. The client address is no proof:
+behind the reverse proxy every request comes from 127.0.0.1.
+"""
+import hmac
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import Http404, HttpResponse
+from django.template.backends import django as django_backend
+
+TIME_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_sample = threading.local()
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.series = defaultdict(
+            lambda: [[0] * (len(self.buckets) + 1), 0, 0])
+
+    def observe(self, view, value):
+        with self.lock:
+            counts, _, _ = series = self.series[view]
+            counts[bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def clear(self):
+        with self.lock:
+            self.series.clear()
+
+    def render(self):
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} histogram',
+        ]
+        with self.lock:
+            series = sorted(
+                (view, list(counts), total, count)
+                for view, (counts, total, count) in self.series.items()
+            )
+        for view, counts, total, count in series:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + ('+Inf',), counts):
+                cumulative += bucket
+                lines.append(
+                    f'{self.name}_bucket{{view="{view}",le="{bound}"}} '
+                    f'{cumulative}'
+                )
+            lines.append(f'{self.name}_sum{{view="{view}"}} {total}')
+            lines.append(f'{self.name}_count{{view="{view}"}} {count}')
+        return lines
+
+
+REQUEST_TIME = Histogram(
+    'yatube_request_duration_seconds', 'Время обработки запроса',
+    TIME_BUCKETS)
+QUERY_COUNT = Histogram(
+    'yatube_db_queries', 'Число запросов к базе за запрос', QUERY_BUCKETS)
+QUERY_TIME = Histogram(
+    'yatube_db_duration_seconds', 'Время запросов к базе за запрос',
+    TIME_BUCKETS)
+TEMPLATE_TIME = Histogram(
+    'yatube_template_duration_seconds', 'Время отрисовки шаблонов за запрос',
+    TIME_BUCKETS)
+HISTOGRAMS = (REQUEST_TIME, QUERY_COUNT, QUERY_TIME, TEMPLATE_TIME)
+
+
+class Sample:
+    __slots__ = ('queries', 'query_time', 'template_time')
+
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+        self.template_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.query_time += time.perf_counter() - start
+            self.queries += 1
+
+
+def _timed_render(render):
+    # The template_rendered signal is only sent under the test runner, so
+    # the backend template itself is wrapped.
+    def timed_render(self, context=None, request=None):
+        sample = getattr(_sample, 'current', None)
+        if sample is None:
+            return render(self, context, request)
+        start = time.perf_counter()
+        try:
+            return render(self, context, request)
+        finally:
+            sample.template_time += time.perf_counter() - start
+
+    timed_render.metrics_wrapped = True
+    return timed_render
+
+
+def instrument_templates():
+    render = django_backend.Template.render
+    if not getattr(render, 'metrics_wrapped', False):
+        django_backend.Template.render = _timed_render(render)
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.sample_rate = settings.METRICS_SAMPLE_RATE
+        if not self.sample_rate:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        instrument_templates()
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+        sample = _sample.current = Sample()
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(sample))
+                response = self.get_response(request)
+        finally:
+            _sample.current = None
+        elapsed = time.perf_counter() - start
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        REQUEST_TIME.observe(view, elapsed)
+        QUERY_COUNT.observe(view, sample.queries)
+        QUERY_TIME.observe(view, sample.query_time)
+        TEMPLATE_TIME.observe(view, sample.template_time)
+        return response
+
+
+def has_metrics_access(request):
+    if request.user.is_staff:
+        return True
+    token = settings.METRICS_TOKEN
+    authorization = request.META.get('HTTP_AUTHORIZATION', '')
+    return bool(token) and hmac.compare_digest(
+        authorization.encode(), f'Bearer {token}'.encode())
+
+
+def metrics(request):
+    if not has_metrics_access(request):
+        raise Http404
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return HttpResponse(
+        '\n'.join(lines) + '\n',
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -0,0 +1,118 @@
+"""Write throttling per user, or per IP address for anonymous clients.
+
+Each limited view has a rate such as ``'10/m'`` in ``RATELIMITS``. Requests
+are counted in fixed windows of that length in the ``RATELIMIT_CACHE``
+cache with ``add``/``incr``, which are atomic in memcached and Redis, so
+the limit holds across worker processes sharing the cache. The allowance is
+a sliding window: the previous window's count is weighted by the part of it
+still inside the last period.
+
+Over the limit the view is not called at all; the client gets 429 with
+``Retry-After``. Rejected requests are not counted.
+
+Behind a reverse proxy every request comes from the proxy's address, so
+anonymous clients are told apart by ``X-Forwarded-For``: the right-most
+address in it that is not one of ``TRUSTED_PROXIES``. Hops to the left of
+it were written by the client and are ignored.
+"""
+import ipaddress
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+UNITS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+UNSAFE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+
+def parse_rate(rate):
+    """``'10/m'`` -> ``(10, 60)``."""
+    count, unit = rate.split('/')
+    return int(count), UNITS[unit]
+
+
+def is_trusted_proxy(address):
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(proxy)
+        for proxy in settings.TRUSTED_PROXIES
+    )
+
+
+def client_ip(request):
+    address = request.META.get('REMOTE_ADDR', '')
+    hops = [
+        hop.strip()
+        for hop in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')
+        if hop.strip()
+    ]
+    while hops and is_trusted_proxy(address):
+        address = hops.pop()
+    return address
+
+
+def client_key(request):
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return f'ip:{client_ip(request)}'
+
+
+def _hit(cache, key, period):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # First request in the window, or the key was just evicted.
+        if cache.add(key, 1, period * 2):
+            return 1
+        return cache.incr(key)
+
+
+def check_rate(scope, request):
+    """Count the request; return seconds to wait if it is over the limit."""
+    limit, period = parse_rate(settings.RATELIMITS[scope])
+    cache = caches[settings.RATELIMIT_CACHE]
+    now = time.time()
+    window, elapsed = divmod(now, period)
+    prefix = f'ratelimit:{scope}:{client_key(request)}'
+    current_key = f'{prefix}:{int(window)}'
+    count = _hit(cache, current_key, period)
+    previous = cache.get(f'{prefix}:{int(window) - 1}', 0)
+    weight = 1 - elapsed / period
+    if previous * weight + count <= limit:
+        return None
+    try:
+        cache.decr(current_key)
+    except ValueError:
+        pass
+    if count > limit or not previous:
+        wait = period - elapsed
+    else:
+        # When the previous window has slid out far enough.
+        wait = period * (1 - (limit - count) / previous) - elapsed
+    return max(1, math.ceil(wait))
+
+
+def ratelimit(scope):
+    """Limit unsafe requests to the view by the ``RATELIMITS[scope]`` rate.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method in UNSAFE_METHODS:
+                retry_after = check_rate(scope, request)
+                if retry_after is not None:
+                    response = HttpResponse(
+                        'Слишком много запросов, попробуйте позже',
+                        content_type='text/plain; charset=utf-8',
+                        status=429)
+                    response['Retry-After'] = str(retry_after)
+                    return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
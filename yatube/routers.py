@@ -0,0 +1,98 @@
+"""Reads from the replicas in ``DATABASE_REPLICAS``, writes to the primary.
+
+A request that writes, and every request of the same client for
+``REPLICA_PIN_SECONDS`` after it, reads from the primary as well, so users
+see their own posts before the replicas catch up. So does any code running
+inside a transaction on the primary, such as migrations and the bulk
+management commands.
+
+Views that fill the feed fragment cache read from the primary too, through
+``use_primary()``: a page rendered from a lagging replica would be cached
+under the feed version the write has just bumped, and served for the whole
+``FEED_CACHE_TIMEOUT``. Their conditional-GET validators still come from a
+replica, except the index's, which is its feed version in the cache.
+"""
+import contextlib
+import random
+import threading
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+PRIMARY = 'default'
+PIN_COOKIE = 'read_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+_state = threading.local()
+
+
+@contextlib.contextmanager
+def use_primary():
+    """Send every read inside the block to the primary."""
+    depth = getattr(_state, 'depth', 0)
+    _state.depth = depth + 1
+    try:
+        yield
+    finally:
+        _state.depth = depth
+
+
+def read_replicas():
+    """Replica aliases, minus those that are the primary itself.
+
+    Under the test runner a replica with ``TEST['MIRROR']`` points at the
+    primary's test database; reading through it would only trip the test
+    isolation checks.
+    """
+    databases = connections.databases
+    primary = databases[PRIMARY]['NAME']
+    return [
+        alias for alias in settings.DATABASE_REPLICAS
+        if databases.get(alias, {}).get('NAME') != primary
+    ]
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if getattr(_state, 'depth', 0):
+            return PRIMARY
+        # Reads inside a transaction on the primary must see its writes.
+        if connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        replicas = read_replicas()
+        if not replicas:
+            return PRIMARY
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema together with the data.
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaPinMiddleware:
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        writes = request.method not in SAFE_METHODS
+        if not writes and PIN_COOKIE not in request.COOKIES:
+            return self.get_response(request)
+        with use_primary():
+            response = self.get_response(request)
+        if writes:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax')
+        return response
@@ -45,9 +45,12 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'sorl.thumbnail',
 ]
 
 MIDDLEWARE = [
+    'yatube.metrics.MetricsMiddleware',
+    'yatube.routers.ReplicaPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -64,8 +67,15 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compiled once per process, includes too; template edits need
+            # a restart, even with DEBUG on.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -86,8 +96,35 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        # Keep connections between requests; yatube.sqlite checks them.
+        'CONN_MAX_AGE': 600,
     }
 }
+# Applied to every new SQLite connection by yatube.sqlite.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    # Negative values are KiB.
+    'cache_size': -64 * 1024,
+    'temp_store': 'memory',
+}
+
+DATABASE_ROUTERS = ['yatube.routers.PrimaryReplicaRouter']
+# Aliases that serve reads. Locally a copy of the database can play the
+# replica: set YATUBE_REPLICA_DB and refresh it with `manage.py sync_replica`.
+DATABASE_REPLICAS = []
+if os.environ.get('YATUBE_REPLICA_DB'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, os.environ['YATUBE_REPLICA_DB']),
+        'CONN_MAX_AGE': 600,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS = ['replica']
+# After a write the client reads from the primary for this long.
+REPLICA_PIN_SECONDS = 10
 
 
 # Password validation
@@ -108,6 +145,15 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Sessions live in the signed cookie, so reading one costs no query. The
+# cache backend would do as well once CACHES is shared between processes.
+SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
+
+AUTHENTICATION_BACKENDS = ['users.backends.CachedModelBackend']
+# Seconds and number of users users.backends keeps in process memory.
+USER_CACHE_TIMEOUT = 60
+USER_CACHE_SIZE = 10000
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/2.2/topics/i18n/
@@ -128,9 +174,78 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'static')
+# Hashed names and .gz/.br copies; serve STATIC_ROOT with
+# "Cache-Control: public, max-age=31536000, immutable". They need
+# collectstatic, which development and tests do without.
+STATICFILES_STORAGE = (
+    'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+    else 'yatube.storage.CompressedManifestStaticFilesStorage'
+)
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Side effects of post writes (followers' feeds, emails, thumbnails) are
+# stored in posts_task and run by the run_worker command. Eager tasks run
+# inline in the request instead, image resizing included; tests turn it on
+# where they need the results.
+TASKS_ALWAYS_EAGER = False
+TASKS_MAX_ATTEMPTS = 5
+# Seconds before the first retry; doubled on every next one.
+TASKS_RETRY_DELAY = 10
 
 LOGIN_URL = '/auth/login/'
 LOGIN_REDIRECT_URL = 'posts:index'
 
+# Scheme and host of the site, for links sent outside a request (emails).
+SITE_URL = os.environ.get('YATUBE_SITE_URL', 'http://localhost:8000')
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+# Share of requests timed by yatube.metrics; 0 disables the middleware.
+METRICS_SAMPLE_RATE = 0.01
+# Bearer token of the scraper reading /metrics; staff users need none.
+METRICS_TOKEN = os.environ.get('YATUBE_METRICS_TOKEN', '')
+
+POSTS_PER_PAGE = 10
+GROUPS_PER_PAGE = 50
+# Entries per RSS feed; they are streamed, not held in memory.
+RSS_ITEMS = 1000
+# Skip COUNT(*) on feeds; the number of pages becomes a lower bound.
+POSTS_APPROXIMATE_COUNT = False
+# The admin counts posts exactly up to this many; beyond it the total comes
+# from SQLite statistics, refreshed after bulk writes.
+ADMIN_COUNT_LIMIT = 10000
+
+# Authors with this many followers are not copied into follower feeds on
+# write; their posts are merged in when a feed is read.
+FOLLOW_FANOUT_LIMIT = 10000
+# Recent posts of an author copied into the feed of a new follower, and
+# into every feed when the author drops below FOLLOW_FANOUT_LIMIT.
+FOLLOW_BACKFILL_POSTS = 100
+# Followers whose feeds one refill_timelines task fills.
+FOLLOW_REFILL_BATCH = 1000
+
+# Feed versions live in the cache, so several worker processes need a shared
+# backend (FileBasedCache or memcached) for invalidation to reach all of them.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+# Writes allowed per user, or per IP address for anonymous clients; see
+# yatube.ratelimit. The cache must be shared by all worker processes
+# (memcached, Redis) for the limits to hold across them.
+RATELIMITS = {
+    'new_post': '10/m',
+    'post_edit': '30/m',
+    'signup': '5/h',
+}
+RATELIMIT_CACHE = 'default'
+# Addresses or networks of the reverse proxies that append the client's
+# address to X-Forwarded-For.
+TRUSTED_PROXIES = ['127.0.0.1', '::1']
+
+# Rendered feed pages; invalidated by post writes, see posts.cache.
+FEED_CACHE_TIMEOUT = 60 * 15
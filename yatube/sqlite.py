@@ -0,0 +1,28 @@
+"""SQLite tuning applied to every new connection, and connection checks.
+
+WAL lets readers carry on while a writer commits, ``synchronous=NORMAL``
+is durable enough in WAL mode, and the busy timeout makes a writer wait for
+the lock instead of failing. Connections are kept for ``CONN_MAX_AGE``;
+``check_connections`` closes the ones that went bad between requests.
+"""
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def apply_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(request_started)
+def check_connections(**kwargs):
+    for connection in connections.all():
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
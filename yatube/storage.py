@@ -0,0 +1,73 @@
+"""Static files under content-hashed names, with gzip and brotli copies.
+
+``collectstatic`` writes every asset as ``name.<hash>.ext`` plus the
+``staticfiles.json`` manifest that ``{% static %}`` resolves names
+through, so a changed file always gets a new URL and the proxy can serve
+``STATIC_ROOT`` with immutable year-long cache headers. Text assets also
+get ``.gz`` and, when the ``brotli`` package is installed, ``.br`` siblings
+for ``gzip_static``/``brotli_static``.
+
+Names missing from the manifest are hashed from the collected file, and
+names that were never collected keep their plain URL instead of failing
+the page. Development and tests, which skip ``collectstatic``,
+use the plain ``StaticFilesStorage``; see ``STATICFILES_STORAGE``.
+"""
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSED_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.json', '.txt', '.html', '.xml',
+    '.eot', '.otf', '.ttf',
+)
+# Copies that do not save at least this share of the size are dropped.
+MIN_SAVING = 0.05
+
+
+def compressors():
+    yield '.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield '.br', lambda data: brotli.compress(data, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Not collected at all; remembered so the page does not stat
+            # the file again on every render.
+            self.hashed_files[self.hash_key(self.clean_name(name))] = name
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            if name.endswith(COMPRESSED_EXTENSIONS):
+                self.compress(name)
+
+    def compress(self, name):
+        path = self.path(name)
+        data = None
+        for suffix, compress in compressors():
+            if os.path.exists(path + suffix):
+                # Hashed names change with the content.
+                continue
+            if data is None:
+                with open(path, 'rb') as source:
+                    data = source.read()
+            compressed = compress(data)
+            if len(compressed) > len(data) * (1 - MIN_SAVING):
+                continue
+            with open(path + suffix, 'wb') as target:
+                target.write(compressed)